@@ -5,37 +5,43 @@
 #* Dr.P.E.Colla (c) 2022                                                   *
 #* Creative commons                                                        *
 #*-------------------------------------------------------------------------*
-import matplotlib.pyplot as plt
-
-def collatz_iterations(n, max_iter=1000, max_value=10**6):
-    count = 0
-    seen = set()  # Para detectar ciclos
-
-    while n != 1 and count < max_iter:
-        if n in seen or n > max_value:  # Si hay ciclo o el número crece demasiado, detenemos
-            return max_iter
-        seen.add(n)
-
-        if n % 2 == 0:
-            n = n // 2
-        else:
-            n = 2 * n + 1  # Variante 2n+1 de Collatz
-        count += 1
-
-    return count
-
-# Generar datos
-n_values = list(range(1, 10001))
-iterations = [collatz_iterations(n) for n in n_values]
-
-# Crear gráfico
-plt.figure(figsize=(10, 6))
-plt.scatter(iterations, n_values, color="blue", s=1)
-plt.xlabel("Número de iteraciones")
-plt.ylabel("Número inicial n")
-plt.title("Conjetura de Collatz (variante 2n+1)")
-
-# Guardar gráfico
-plt.savefig("collatz_plot.png")
-plt.show()
-
+import argparse
+
+from collatz_engine import collatz_batch, collatz_range
+from collatz_raster import DensityRaster
+
+parser = argparse.ArgumentParser(description="Conjetura de Collatz (variante 2n+1)")
+parser.add_argument("--upper", type=int, default=10000, help="último n inicial")
+parser.add_argument("--headless", action="store_true",
+                    help="acumular un raster de densidad y sólo escribir el PNG")
+parser.add_argument("--width", type=int, default=800, help="ancho del raster")
+parser.add_argument("--height", type=int, default=600, help="alto del raster")
+parser.add_argument("--max-iter", type=int, default=1000)
+parser.add_argument("--out", default="collatz_plot.png")
+args = parser.parse_args()
+
+if args.headless:
+    # Los bloques (n, iteraciones) del motor se acumulan en un raster de
+    # tamaño fijo: la memoria no depende de --upper y no se usa pyplot.
+    raster = DensityRaster(0, args.max_iter, 1, args.upper, args.width, args.height)
+    for n_values, iterations in collatz_range(1, args.upper, args.max_iter):
+        raster.add(iterations, n_values)
+    raster.to_png(args.out, xlabel="Número de iteraciones", ylabel="Número inicial n",
+                  title="Conjetura de Collatz (variante 2n+1)")
+else:
+    import matplotlib.pyplot as plt
+
+    # Generar datos
+    n_values = list(range(1, args.upper + 1))
+    iterations = collatz_batch(n_values, args.max_iter).tolist()
+
+    # Crear gráfico
+    plt.figure(figsize=(10, 6))
+    plt.scatter(iterations, n_values, color="blue", s=1)
+    plt.xlabel("Número de iteraciones")
+    plt.ylabel("Número inicial n")
+    plt.title("Conjetura de Collatz (variante 2n+1)")
+
+    # Guardar gráfico
+    plt.savefig(args.out)
+    plt.show()
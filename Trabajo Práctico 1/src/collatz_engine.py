@@ -0,0 +1,259 @@
+#!/usr/bin/python
+#*-------------------------------------------------------------------------*
+#* collatz_engine.py                                                       *
+#* Iteraciones de Collatz con reglas configurables: escalar y por lotes   *
+#* Creative commons                                                        *
+#*-------------------------------------------------------------------------*
+import json
+import os
+from collections import OrderedDict
+
+import numpy as np
+
+# Cantidad de valores iniciales que se procesan juntos en collatz_range.
+CHUNK_SIZE = 1 << 20
+
+# Códigos de stopping_time para trayectorias que no llegan a 1. La función
+# escalar devuelve max_iter en ambos casos; el caché los distingue.
+NO_CONVERGE = -1  # entra en un ciclo o el valor no es positivo
+EXCEDE = -2       # algún valor de la trayectoria supera max_value
+
+
+class CollatzRule:
+    """
+    Regla de Collatz generalizada por clases de residuo módulo m:
+    si n % m == r, el siguiente valor es (mult * n + add) // div, con
+    (mult, add, div) = tabla[r]. La tabla se valida para que la división
+    sea exacta y se compila a arrays NumPy para el camino por lotes.
+    """
+
+    def __init__(self, modulus, tabla, nombre=None):
+        if modulus < 1 or len(tabla) != modulus:
+            raise ValueError("La tabla debe tener una entrada por residuo módulo m")
+        tabla = tuple((int(a), int(b), int(d)) for a, b, d in tabla)
+        for r, (a, b, d) in enumerate(tabla):
+            if d < 1:
+                raise ValueError(f"Divisor inválido para el residuo {r}: {d}")
+            if (a * r + b) % d or (a * modulus) % d:
+                raise ValueError(f"({a}·n + {b}) no es divisible por {d} "
+                                 f"para n ≡ {r} (mod {modulus})")
+        self.modulus = modulus
+        self.tabla = tabla
+        self.nombre = nombre or f"mod {modulus}: {tabla}"
+        self.mult = np.array([a for a, _, _ in tabla], dtype=np.int64)
+        self.add = np.array([b for _, b, _ in tabla], dtype=np.int64)
+        self.div = np.array([d for _, _, d in tabla], dtype=np.int64)
+        # Si ningún valor <= 0 puede volver a ser positivo, esos valores nunca
+        # llegan a 1 y el camino por lotes los descarta sin iterarlos.
+        self.cierra_no_positivos = all(
+            a >= 0 and (a * (r - modulus if r else 0) + b) // d <= 0
+            for r, (a, b, d) in enumerate(tabla))
+
+    @classmethod
+    def affine(cls, a, b):
+        """Pares: n // 2; impares: a·n + b."""
+        return cls(2, ((1, 0, 2), (a, b, 1)), nombre=f"{a}n{b:+d}")
+
+    def paso(self, n):
+        a, b, d = self.tabla[n % self.modulus]
+        return (a * n + b) // d
+
+    def max_entrada(self):
+        """Mayor |n| que se puede avanzar un paso sin desbordar int64."""
+        limite = np.iinfo(np.int64).max - int(np.abs(self.add).max())
+        return limite // max(int(np.abs(self.mult).max()), 1)
+
+    def key(self):
+        return [self.modulus, [list(t) for t in self.tabla]]
+
+    def __repr__(self):
+        return f"CollatzRule({self.nombre})"
+
+
+CLASSIC = CollatzRule.affine(3, 1)
+VARIANTE_2N1 = CollatzRule.affine(2, 1)  # Variante 2n+1 de Collatz
+
+
+def collatz_iterations(n, max_iter=1000, max_value=10**6, rule=VARIANTE_2N1):
+    count = 0
+    seen = set()  # Para detectar ciclos
+
+    while n != 1 and count < max_iter:
+        if n in seen or n > max_value:  # Si hay ciclo o el número crece demasiado, detenemos
+            return max_iter
+        seen.add(n)
+        n = rule.paso(n)
+        count += 1
+
+    return count
+
+
+def collatz_batch(starts, max_iter=1000, max_value=10**6, rule=VARIANTE_2N1):
+    """
+    Versión vectorizada de collatz_iterations: avanza todos los valores
+    iniciales juntos, un paso por vuelta, y retorna un array int64 con la
+    misma cantidad de iteraciones que daría la función escalar.
+
+    No hace falta el conjunto `seen`: un valor que entra en un ciclo nunca
+    llega a 1 ni supera max_value, así que agota max_iter y el resultado
+    coincide con el que devuelve la detección de ciclos.
+    """
+    limite = rule.max_entrada()
+    if max_value > limite:
+        raise ValueError("max_value demasiado grande para aritmética int64")
+    n = np.asarray(starts, dtype=np.int64)
+    resultado = np.full(n.shape, max_iter, dtype=np.int64)
+
+    if rule.cierra_no_positivos:
+        idx = np.flatnonzero(n >= 1)
+    else:
+        idx = np.arange(n.size)
+    valores = n.ravel()[idx]
+    plano = resultado.ravel()
+    for count in range(max_iter + 1):
+        llegaron = valores == 1
+        plano[idx[llegaron]] = count
+        # Los que superan max_value quedan con max_iter.
+        seguir = ~llegaron & (valores <= max_value)
+        if rule.cierra_no_positivos:
+            seguir &= valores >= 1
+        if count == max_iter or not seguir.any():
+            break
+        idx = idx[seguir]
+        valores = valores[seguir]
+        if valores.min() < -limite:
+            raise OverflowError("La trayectoria negativa excede int64; "
+                                "usar collatz_iterations")
+        r = valores % rule.modulus
+        valores = (rule.mult[r] * valores + rule.add[r]) // rule.div[r]
+    return resultado
+
+
+def collatz_range(lower, upper, max_iter=1000, max_value=10**6, rule=VARIANTE_2N1,
+                  chunk_size=CHUNK_SIZE):
+    """
+    Genera (n, iteraciones) por bloques de chunk_size valores iniciales
+    para [lower, upper], con memoria acotada por el tamaño del bloque.
+    """
+    for inicio in range(lower, upper + 1, chunk_size):
+        n = np.arange(inicio, min(inicio + chunk_size, upper + 1), dtype=np.int64)
+        yield n, collatz_batch(n, max_iter, max_value, rule)
+
+
+class CollatzCache:
+    """
+    Caché de stopping times (pasos hasta llegar a 1) para una regla.
+
+    - n < dense_limit: array denso int32 (0 = desconocido, s + 1 = conocido,
+      o NO_CONVERGE / EXCEDE), opcionalmente persistido con memmap en `path`.
+    - n >= dense_limit: diccionario LRU de a lo sumo lru_size entradas.
+
+    Una caminata se corta al llegar a un valor conocido y suma su stopping
+    time; después se guarda el resultado para todos los valores recorridos.
+    Los stopping times no dependen de max_iter (se aplica al consultar),
+    pero sí de max_value y de la regla, que quedan fijos para el caché.
+    La regla debe mantener los valores <= 0 en valores <= 0, para que toda
+    caminata termine (en 1, en un ciclo o por encima de max_value).
+    """
+
+    def __init__(self, max_value=10**6, dense_limit=1 << 20, lru_size=1 << 16, path=None,
+                 rule=VARIANTE_2N1):
+        if not rule.cierra_no_positivos:
+            raise ValueError("CollatzCache requiere una regla que no saque "
+                             "a los valores <= 0 de los no positivos")
+        self.max_value = max_value
+        self.rule = rule
+        self.lru_size = lru_size
+        self.path = path
+        self._lru = OrderedDict()
+        if path is None:
+            self._denso = np.zeros(dense_limit, dtype=np.int32)
+        else:
+            self._denso = self._abrir(path, dense_limit)
+
+    def _abrir(self, path, dense_limit):
+        """Abre (o crea) el array denso en disco, agrandándolo si hace falta."""
+        meta_path = path + ".json"
+        previo = None
+        if os.path.exists(path) and os.path.exists(meta_path):
+            with open(meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+            if meta == self._meta():
+                previo = np.load(path, mmap_mode="r")
+        if previo is not None and len(previo) >= dense_limit:
+            return np.lib.format.open_memmap(path, mode="r+")
+
+        tmp = path + ".tmp"
+        denso = np.lib.format.open_memmap(tmp, mode="w+", dtype=np.int32,
+                                          shape=(dense_limit,))
+        if previo is not None:
+            denso[:len(previo)] = previo
+            del previo
+        denso.flush()
+        del denso
+        os.replace(tmp, path)
+        with open(meta_path, "w", encoding="utf-8") as f:
+            json.dump(self._meta(), f)
+        return np.lib.format.open_memmap(path, mode="r+")
+
+    def _meta(self):
+        return {"max_value": self.max_value, "rule": self.rule.key()}
+
+    def _get(self, n):
+        if 0 <= n < len(self._denso):
+            codigo = int(self._denso[n])
+            if codigo == 0:
+                return None
+            return codigo - 1 if codigo > 0 else codigo
+        s = self._lru.get(n)
+        if s is not None:
+            self._lru.move_to_end(n)
+        return s
+
+    def _put(self, n, s):
+        if 0 <= n < len(self._denso):
+            self._denso[n] = s + 1 if s >= 0 else s
+            return
+        self._lru[n] = s
+        self._lru.move_to_end(n)
+        if len(self._lru) > self.lru_size:
+            self._lru.popitem(last=False)
+
+    def stopping_time(self, n):
+        """
+        Pasos hasta llegar a 1, o NO_CONVERGE / EXCEDE. Con las mismas
+        reglas de corte que collatz_iterations, salvo max_iter.
+        """
+        camino = []
+        seen = set()
+        while True:
+            s = self._get(n)
+            if s is not None:
+                break
+            if n == 1:
+                s = 0
+                break
+            if n < 1 or n in seen:
+                s = NO_CONVERGE
+                break
+            if n > self.max_value:
+                s = EXCEDE
+                break
+            seen.add(n)
+            camino.append(n)
+            n = self.rule.paso(n)
+        if n >= 1:
+            self._put(n, s)
+        for pasos, m in enumerate(reversed(camino), 1):
+            self._put(m, s + pasos if s >= 0 else s)
+        return s + len(camino) if s >= 0 else s
+
+    def iterations(self, n, max_iter=1000):
+        """Mismo resultado que collatz_iterations con el max_value y la regla del caché."""
+        s = self.stopping_time(n)
+        return min(s, max_iter) if s >= 0 else max_iter
+
+    def flush(self):
+        """Escribe a disco el array denso si el caché es persistente."""
+        if isinstance(self._denso, np.memmap):
+            self._denso.flush()
@@ -0,0 +1,60 @@
+#!/usr/bin/python
+#*-------------------------------------------------------------------------*
+#* collatz_raster.py                                                       *
+#* Raster de densidad 2D acumulado por bloques, renderizado sin GUI        *
+#* Creative commons                                                        *
+#*-------------------------------------------------------------------------*
+import numpy as np
+
+
+class DensityRaster:
+    """
+    Histograma 2D de resolución fija (width x height) sobre los rangos
+    [x_min, x_max] e [y_min, y_max]. Los puntos se agregan por bloques con
+    add(), así que la memoria es la del raster y no depende de cuántos
+    puntos se acumulen.
+    """
+
+    def __init__(self, x_min, x_max, y_min, y_max, width=800, height=600):
+        if width < 1 or height < 1:
+            raise ValueError("El raster debe tener al menos 1x1 píxeles")
+        self.x_min, self.x_max = x_min, x_max
+        self.y_min, self.y_max = y_min, y_max
+        self.width, self.height = width, height
+        self.counts = np.zeros(width * height, dtype=np.int64)
+
+    def _bin(self, valores, minimo, maximo, bins):
+        escala = bins / (maximo - minimo + 1)
+        idx = ((np.asarray(valores, dtype=np.float64) - minimo) * escala).astype(np.int64)
+        return np.clip(idx, 0, bins - 1)
+
+    def add(self, x, y):
+        """Acumula un bloque de puntos (x[i], y[i])."""
+        ix = self._bin(x, self.x_min, self.x_max, self.width)
+        iy = self._bin(y, self.y_min, self.y_max, self.height)
+        self.counts += np.bincount(iy * self.width + ix, minlength=self.counts.size)
+
+    def image(self):
+        """Densidad en escala logarítmica normalizada a [0, 1]; NaN donde no hay puntos."""
+        grilla = self.counts.reshape(self.height, self.width).astype(np.float64)
+        densidad = np.log1p(grilla)
+        if densidad.max() > 0:
+            densidad /= densidad.max()
+        densidad[grilla == 0] = np.nan
+        return densidad
+
+    def to_png(self, path, xlabel="", ylabel="", title="", cmap="Blues"):
+        """Escribe el raster a PNG con el backend Agg (no abre ventanas)."""
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        fig = Figure(figsize=(10, 6))
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot()
+        ax.imshow(self.image(), origin="lower", aspect="auto", cmap=cmap,
+                  interpolation="nearest", vmin=0, vmax=1,
+                  extent=(self.x_min, self.x_max + 1, self.y_min, self.y_max + 1))
+        ax.set_xlabel(xlabel)
+        ax.set_ylabel(ylabel)
+        ax.set_title(title)
+        fig.savefig(path)
@@ -5,25 +5,31 @@
 #* Dr.P.E.Colla (c) 2022                                                   *
 #* Creative commons                                                        *
 #*-------------------------------------------------------------------------*
+import argparse
 import sys
+
+import factorial_engine
+
 def factorial(num): 
     if num < 0: 
         print("Factorial de un número negativo no existe")
         return 0
-    elif num == 0: 
-        return 1
-        
-    else: 
-        fact = 1
-        while(num > 1): 
-            fact *= num 
-            num -= 1
-        return fact 
+    return factorial_engine.factorial(num)
+
+parser = argparse.ArgumentParser(description="Factorial de un número o rango")
+parser.add_argument("entrada", nargs="?", help="número o rango (ej. 4-8)")
+modo = parser.add_mutually_exclusive_group()
+modo.add_argument("--digits", action="store_true", help="sólo la cantidad de dígitos")
+modo.add_argument("--mod", type=int, help="el factorial módulo MOD")
+modo.add_argument("--log10", action="store_true", help="log10 del factorial")
+args = parser.parse_args()
+if args.mod is not None and args.mod < 1:
+    parser.error("--mod debe ser un entero positivo")
 
-if len(sys.argv) < 2:
+if args.entrada is None:
     entrada = input("Ingrese un número o rango (ej. 4-8): ")
 else:
-    entrada=(sys.argv[1])
+    entrada = args.entrada
 
 # Verificar si es un rango
 if "-" in entrada:
@@ -33,7 +39,10 @@ if "-" in entrada:
 else:
     desde, hasta = int(entrada), int(entrada)
 
-# Calcular factoriales en el rango
-for i in range(desde, hasta + 1):
-    print(f"Factorial {i}! es {factorial(i)}") 
+# Los factoriales grandes superan el límite de dígitos de str(int)
+if hasattr(sys, "set_int_max_str_digits"):
+    sys.set_int_max_str_digits(0)
 
+# Calcular factoriales en el rango: desde! una vez y luego un producto por valor
+for linea in factorial_engine.range_lines(desde, hasta, args.digits, args.mod, args.log10):
+    print(linea, flush=True)
@@ -5,8 +5,11 @@
 #* Dr.P.E.Colla (c) 2022                                                   *
 #* Creative commons                                                        *
 #*-------------------------------------------------------------------------*
+import argparse
 import sys
 
+import factorial_engine
+
 class Factorial:
     def __init__(self, num):
         self.num = num
@@ -15,19 +18,23 @@ class Factorial:
         if self.num < 0:
             print("Factorial de un número negativo no existe")
             return 0
-        elif self.num == 0:
-            return 1
-        else:
-            fact = 1
-            for i in range(1, self.num + 1):
-                fact *= i
-            return fact
+        return factorial_engine.factorial(self.num)
 
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
+    parser = argparse.ArgumentParser(description="Factorial de un número o rango")
+    parser.add_argument("entrada", nargs="?", help="número o rango (ej. 4-8)")
+    modo = parser.add_mutually_exclusive_group()
+    modo.add_argument("--digits", action="store_true", help="sólo la cantidad de dígitos")
+    modo.add_argument("--mod", type=int, help="el factorial módulo MOD")
+    modo.add_argument("--log10", action="store_true", help="log10 del factorial")
+    args = parser.parse_args()
+    if args.mod is not None and args.mod < 1:
+        parser.error("--mod debe ser un entero positivo")
+
+    if args.entrada is None:
         entrada = input("Ingrese un número o rango (ej. 4-8): ")
     else:
-        entrada = sys.argv[1]
+        entrada = args.entrada
 
     # Manejo de rangos
     if "-" in entrada:
@@ -37,8 +44,10 @@ if __name__ == "__main__":
     else:
         desde, hasta = int(entrada), int(entrada)
 
-    for i in range(desde, hasta + 1):
-        fact_obj = Factorial(i)
-        print(f"Factorial {i}! es {fact_obj.calcular()}")
-
+    # Los factoriales grandes superan el límite de dígitos de str(int)
+    if hasattr(sys, "set_int_max_str_digits"):
+        sys.set_int_max_str_digits(0)
 
+    # desde! se calcula una vez; cada valor siguiente es un solo producto
+    for linea in factorial_engine.range_lines(desde, hasta, args.digits, args.mod, args.log10):
+        print(linea, flush=True)
@@ -0,0 +1,299 @@
+#!/usr/bin/python
+#*-------------------------------------------------------------------------*
+#* factorial_engine.py                                                     *
+#* Motor de factoriales para enteros grandes (división binaria)            *
+#* Creative commons                                                        *
+#*-------------------------------------------------------------------------*
+import math
+import sys
+from functools import lru_cache
+from pathlib import Path
+
+# El test de primalidad está un nivel arriba, en src/primality.py.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from primality import is_prime  # pylint: disable=wrong-import-position
+
+try:
+    import gmpy2  # pylint: disable=import-error
+except ImportError:  # sin GMP se usa la aritmética de enteros de Python
+    gmpy2 = None
+
+try:
+    import numpy as np  # pylint: disable=import-error
+except ImportError:  # sólo FactorialTables lo necesita
+    np = None
+
+# Por debajo de este largo de rango se multiplica directo con math.prod.
+_HOJA = 32
+
+# Factores que se multiplican juntos (en C, con math.prod) antes de reducir
+# módulo p en los productos modulares.
+_BLOQUE = 16
+
+# Tamaño máximo de las tablas de factoriales modulares que arma binomial_mod.
+MAX_TABLA = 1 << 24
+
+
+def _producto(a, b, mpz):
+    """Producto a * (a+1) * ... * b por división binaria (operandos balanceados)."""
+    if b - a < _HOJA:
+        return mpz(math.prod(range(a, b + 1)))
+    m = (a + b) // 2
+    return _producto(a, m, mpz) * _producto(m + 1, b, mpz)
+
+
+def product_range(a, b):
+    """Retorna el producto de los enteros de [a, b] (1 si el rango es vacío)."""
+    if b < a:
+        return 1
+    if gmpy2 is not None:
+        return int(_producto(a, b, gmpy2.mpz))
+    return _producto(a, b, int)
+
+
+def factorial(n):
+    """
+    Calcula n!. Lanza ValueError si n < 0.
+    Con gmpy2 usa mpz_fac_ui de GMP (multiplicación FFT); si no, usa
+    math.factorial, que en CPython ya hace división binaria sobre los
+    factores impares en vez de multiplicar de a uno.
+    """
+    if n < 0:
+        raise ValueError("El factorial no está definido para n < 0")
+    if gmpy2 is not None:
+        return int(gmpy2.fac(n))
+    return math.factorial(n)
+
+
+def _rango(desde, hasta, mod):
+    """Igual que factorial_range, pero sin convertir los mpz a int."""
+    if mod is None:
+        fact = factorial(desde)
+        if gmpy2 is not None:
+            fact = gmpy2.mpz(fact)
+    else:
+        fact = 1 % mod
+        for i in range(2, desde + 1):
+            fact = fact * i % mod
+    yield desde, fact
+    for i in range(desde + 1, hasta + 1):
+        fact *= i
+        if mod is not None:
+            fact %= mod
+        yield i, fact
+
+
+def factorial_range(desde, hasta, mod=None):
+    """
+    Genera (i, i!) para i en [desde, hasta]: calcula desde! una sola vez y
+    cada valor siguiente con una única multiplicación. Con `mod` todo el
+    cálculo se hace módulo mod, sin enteros grandes.
+    """
+    if desde < 0:
+        raise ValueError("El factorial no está definido para n < 0")
+    if mod is not None and mod < 1:
+        raise ValueError("El módulo debe ser positivo")
+    if hasta < desde:
+        return
+    for i, valor in _rango(desde, hasta, mod):
+        yield i, int(valor)
+
+
+def log10_factorial(n):
+    """log10(n!) vía lgamma, sin calcular el factorial."""
+    return math.lgamma(n + 1) / math.log(10)
+
+
+def factorial_digits(n):
+    """
+    Cantidad de dígitos decimales de n!. Sale de log10(n!); sólo si la
+    parte fraccionaria queda tan cerca de un entero que el redondeo de
+    lgamma podría cambiar el resultado se calcula n! y se compara exacto.
+    """
+    if n < 0:
+        raise ValueError("El factorial no está definido para n < 0")
+    log = log10_factorial(n)
+    k = math.floor(log)
+    tolerancia = 1e-9 + log * 1e-13
+    if log - k > tolerancia and k + 1 - log > tolerancia:
+        return k + 1
+    k = round(log)
+    return k + (factorial(n) >= 10 ** k)
+
+
+def to_decimal(x):
+    """Texto decimal de x; con gmpy2 evita la conversión cuadrática de int."""
+    if gmpy2 is not None:
+        return gmpy2.mpz(x).digits()
+    return str(x)
+
+
+def range_lines(desde, hasta, digits=False, mod=None, log10=False):
+    """
+    Genera las líneas de salida del modo rango `desde-hasta` a medida que
+    cada valor está listo. `digits`, `mod` y `log10` evitan convertir el
+    número completo a texto, que para factoriales grandes domina el tiempo.
+    """
+    if desde < 0:
+        raise ValueError("El factorial no está definido para n < 0")
+    if log10:
+        for i in range(desde, hasta + 1):
+            yield f"log10({i}!) es {log10_factorial(i):.6f}"
+    elif digits:
+        for i in range(desde, hasta + 1):
+            yield f"Factorial {i}! tiene {factorial_digits(i)} dígitos"
+    elif mod is not None:
+        for i, valor in factorial_range(desde, hasta, mod):
+            yield f"Factorial {i}! mod {mod} es {valor}"
+    else:
+        for i, valor in _rango(desde, hasta, None):
+            yield f"Factorial {i}! es {to_decimal(valor)}"
+
+
+# --- Factoriales modulares ---------------------------------------------------
+
+def _prod_mod(a, b, p):
+    """Producto de [a, b] módulo p, multiplicando de a bloques de _BLOQUE."""
+    r = 1 % p
+    for i in range(a, b + 1, _BLOQUE):
+        r = r * math.prod(range(i, min(i + _BLOQUE, b + 1))) % p
+    return r
+
+
+def _validar_primo(p):
+    """Wilson y Lucas valen sólo módulo un primo: con un compuesto darían cualquier cosa."""
+    if p < 2 or not is_prime(p):
+        raise ValueError(f"El módulo debe ser primo: {p}")
+
+
+def factorial_mod(n, p):
+    """
+    n! mod p, con p primo. Si n >= p el resultado es 0. Si n > p/2 se usa
+    el teorema de Wilson, (p-1)! ≡ -1 (mod p), así que nunca se multiplican
+    más de p/2 factores: n! ≡ -1 / ((n+1)···(p-1)) (mod p).
+    """
+    if n < 0:
+        raise ValueError("El factorial no está definido para n < 0")
+    _validar_primo(p)
+    if n >= p:
+        return 0
+    if n <= (p - 1) // 2:
+        return _prod_mod(2, n, p)
+    return -pow(_prod_mod(n + 1, p - 1, p), -1, p) % p
+
+
+def factorial_mod_many(consultas):
+    """
+    Responde una lista de consultas (n, p) de factorial_mod en el orden
+    recibido. Las consultas se agrupan por p y se ordenan por n, así cada
+    primo se recorre una sola vez: hacia arriba desde 1 para n <= p/2 y
+    hacia abajo desde p-1 (Wilson) para el resto.
+    """
+    consultas = list(consultas)
+    resultados = [0] * len(consultas)
+    por_primo = {}
+    for i, (n, p) in enumerate(consultas):
+        if n < 0:
+            raise ValueError("El factorial no está definido para n < 0")
+        _validar_primo(p)
+        if n < p:
+            por_primo.setdefault(p, []).append((n, i))
+
+    for p, pedidos in por_primo.items():
+        pedidos.sort()
+        mitad = (p - 1) // 2
+        corte = next((j for j, (n, _) in enumerate(pedidos) if n > mitad), len(pedidos))
+
+        actual, prod = 1, 1 % p  # prod == actual! mod p
+        for n, i in pedidos[:corte]:
+            if n > actual:
+                prod = prod * _prod_mod(actual + 1, n, p) % p
+                actual = n
+            resultados[i] = prod
+
+        tope, prod = p - 1, 1  # prod == (tope+1)···(p-1) mod p
+        for n, i in reversed(pedidos[corte:]):
+            prod = prod * _prod_mod(n + 1, tope, p) % p
+            tope = n
+            resultados[i] = -pow(prod, -1, p) % p
+    return resultados
+
+
+class FactorialTables:
+    """
+    Tablas de k! mod p y de su inverso para 0 <= k <= limite, como arrays
+    NumPy int64 (p primo, limite < p < 2^31, así los productos de dos
+    entradas entran en int64).
+    """
+
+    def __init__(self, limite, p):
+        if np is None:
+            raise ImportError("FactorialTables requiere NumPy")
+        _validar_primo(p)
+        if p >= 1 << 31:
+            raise ValueError("p debe ser menor que 2^31 para las tablas int64")
+        if not 0 <= limite < p:
+            raise ValueError("El límite de las tablas debe estar en [0, p)")
+        self.p = p
+        self.limite = limite
+        fact = [1] * (limite + 1)
+        for k in range(2, limite + 1):
+            fact[k] = fact[k - 1] * k % p
+        inv = [1] * (limite + 1)
+        inv[limite] = pow(fact[limite], -1, p)
+        for k in range(limite, 1, -1):
+            inv[k - 1] = inv[k] * k % p
+        self.fact = np.array(fact, dtype=np.int64)
+        self.inv_fact = np.array(inv, dtype=np.int64)
+
+    def _binomial_chico(self, n, k):
+        validos = (k >= 0) & (k <= n)
+        k = np.where(validos, k, 0)
+        n_k = np.where(validos, n - k, 0)
+        r = self.fact[n] * self.inv_fact[k] % self.p * self.inv_fact[n_k] % self.p
+        return np.where(validos, r, 0)
+
+    def binomial(self, n, k):
+        """
+        C(n, k) mod p para escalares o arrays. Si n supera el límite y las
+        tablas cubren hasta p-1, se aplica el teorema de Lucas dígito a
+        dígito en base p.
+        """
+        escalar = np.ndim(n) == 0 and np.ndim(k) == 0
+        n = np.asarray(n, dtype=np.int64)
+        k = np.asarray(k, dtype=np.int64)
+        if (n < 0).any():
+            raise ValueError("n debe ser no negativo")
+        if (n > self.limite).any():
+            if self.limite != self.p - 1:
+                raise ValueError("n supera el límite de las tablas")
+            r = np.where((k >= 0) & (k <= n), 1, 0).astype(np.int64)
+            k = np.maximum(k, 0)
+            while (n > 0).any():
+                r = r * self._binomial_chico(n % self.p, k % self.p) % self.p
+                n, k = n // self.p, k // self.p
+        else:
+            r = self._binomial_chico(n, k)
+        return int(r) if escalar else r
+
+
+@lru_cache(maxsize=8)
+def factorial_tables(limite, p):
+    """FactorialTables compartidas entre llamadas con el mismo (limite, p)."""
+    return FactorialTables(limite, p)
+
+
+def binomial_mod(n, k, p):
+    """
+    C(n, k) mod p (p primo) a partir de tablas de factoriales e inversos.
+    n y k pueden ser arrays. El límite de las tablas se redondea a una
+    potencia de 2 para reutilizarlas entre llamadas.
+    """
+    if np is None:
+        raise ImportError("binomial_mod requiere NumPy")
+    _validar_primo(p)
+    mayor = int(np.max(n))
+    limite = min(p - 1, max(1, 1 << mayor.bit_length()) - 1)
+    if limite > MAX_TABLA:
+        raise ValueError("Las tablas necesarias superan MAX_TABLA")
+    return factorial_tables(limite, p).binomial(n, k)
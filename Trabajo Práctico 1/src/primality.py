@@ -0,0 +1,105 @@
+#!/usr/bin/python3
+#*-------------------------------------------------------------------------*
+#* primality.py                                                            *
+#* Test de primalidad: prefiltro por primos chicos, tabla para n < 2^20    *
+#* y Miller-Rabin determinístico para enteros de 64 bits                   *
+#* Creative commons                                                        *
+#*-------------------------------------------------------------------------*
+import math
+from functools import lru_cache
+
+try:
+    import numpy as np  # pylint: disable=import-error
+except ImportError:  # is_prime_many funciona igual, sin vectorizar
+    np = None
+
+# Por debajo de este límite se responde con la tabla precalculada.
+SMALL_LIMIT = 1 << 20
+
+# Primos del prefiltro: descartan ~88% de los compuestos con un módulo.
+SMALL_PRIMES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47,
+                53, 59, 61, 67, 71, 73, 79, 83, 89, 97)
+
+# Bases de Miller-Rabin. Con BASES_64 el test es exacto para n < 2^64
+# (conjunto de 7 bases de Jim Sinclair); con BASES_PRIMAS es exacto para
+# n < 3.3 * 10^24 y por encima es un test de probable primo.
+BASES_64 = (2, 325, 9375, 28178, 450775, 9780504, 1795265022)
+BASES_PRIMAS = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+
+
+@lru_cache(maxsize=None)
+def small_prime_table():
+    """Tabla (bytearray) con 1 en la posición n si n < SMALL_LIMIT es primo."""
+    tabla = bytearray([1]) * SMALL_LIMIT
+    tabla[0] = tabla[1] = 0
+    for p in range(2, math.isqrt(SMALL_LIMIT - 1) + 1):
+        if tabla[p]:
+            tabla[p * p::p] = bytes((SMALL_LIMIT - 1 - p * p) // p + 1)
+    return tabla
+
+
+def _miller_rabin(n, bases):
+    """Test de Miller-Rabin para n impar > SMALL_LIMIT."""
+    d = n - 1
+    s = (d & -d).bit_length() - 1
+    d >>= s
+    for a in bases:
+        a %= n
+        if a == 0:
+            continue
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def _pasa_prefiltro(n):
+    for p in SMALL_PRIMES:
+        if n % p == 0:
+            return False
+    return True
+
+
+def is_prime(n):
+    """Retorna True si n es primo."""
+    if n < SMALL_LIMIT:
+        return n >= 0 and bool(small_prime_table()[n])
+    if not _pasa_prefiltro(n):
+        return False
+    return _miller_rabin(n, BASES_64 if n < 1 << 64 else BASES_PRIMAS)
+
+
+def is_prime_many(valores):
+    """
+    Clasifica un iterable de enteros y retorna una lista de bool.
+    Con NumPy (y valores entre 0 y 2^64) la tabla y el prefiltro se aplican
+    vectorizados; Miller-Rabin sólo se corre sobre los que sobreviven.
+    """
+    valores = list(valores)
+    if np is None:
+        return [is_prime(n) for n in valores]
+    # Sólo se vectoriza si todos son enteros no negativos de hasta 64 bits;
+    # floats, enteros grandes (dtype object) o negativos van por is_prime,
+    # así ambas funciones aceptan y rechazan exactamente lo mismo.
+    crudo = np.asarray(valores)
+    if crudo.dtype.kind not in "iu" or (crudo.dtype.kind == "i" and (crudo < 0).any()):
+        return [is_prime(n) for n in valores]
+    arr = crudo.astype(np.uint64)
+
+    resultado = np.zeros(arr.shape, dtype=bool)
+    chicos = arr < SMALL_LIMIT
+    tabla = np.frombuffer(small_prime_table(), dtype=np.uint8)
+    resultado[chicos] = tabla[arr[chicos]].astype(bool)
+
+    candidatos = ~chicos
+    for p in SMALL_PRIMES:
+        candidatos &= arr % np.uint64(p) != 0
+    for i in np.flatnonzero(candidatos):
+        resultado[i] = _miller_rabin(int(arr[i]), BASES_64)
+    return resultado.tolist()
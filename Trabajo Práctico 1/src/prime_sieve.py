@@ -0,0 +1,186 @@
+#!/usr/bin/python3
+#*-------------------------------------------------------------------------*
+#* prime_sieve.py                                                          *
+#* Criba de Eratóstenes segmentada para enumerar primos en un intervalo    *
+#* Creative commons                                                        *
+#*-------------------------------------------------------------------------*
+import math
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import compress
+
+# Bytes por segmento: cada byte representa un impar, así que un segmento
+# cubre 2 * SEGMENT_SIZE enteros. 32 KiB entra en la caché L1 de datos.
+SEGMENT_SIZE = 32 * 1024
+
+# Segmentos que procesa cada tarea en modo paralelo (amortiza el envío).
+SEGMENTS_PER_TASK = 16
+
+
+def base_primes(limit):
+    """Retorna la lista de primos <= limit con una criba simple."""
+    if limit < 2:
+        return []
+    criba = bytearray([1]) * (limit + 1)
+    criba[0] = criba[1] = 0
+    for p in range(2, math.isqrt(limit) + 1):
+        if criba[p]:
+            criba[p * p::p] = bytes((limit - p * p) // p + 1)
+    return list(compress(range(limit + 1), criba))
+
+
+def sieve_segment(low, high, primes):
+    """
+    Criba los impares de [low, high), con low impar.
+    Retorna un bytearray donde flags[i] == 1 si low + 2*i es primo.
+    `primes` son los primos impares base (sin el 2), en orden creciente.
+    """
+    size = (high - low + 1) // 2
+    flags = bytearray([1]) * size
+    for p in primes:
+        cuadrado = p * p
+        if cuadrado >= high:
+            break
+        inicio = max(cuadrado, (low + p - 1) // p * p)
+        if inicio % 2 == 0:  # sólo se tachan múltiplos impares
+            inicio += p
+        idx = (inicio - low) // 2
+        if idx < size:
+            flags[idx::p] = bytes((size - 1 - idx) // p + 1)
+    return flags
+
+
+def _segmentos(lower, upper, segment_size):
+    """Genera los límites (low, high) de cada segmento de impares."""
+    span = 2 * segment_size
+    low = lower | 1  # primer impar >= lower
+    while low <= upper:
+        yield low, min(low + span, upper + 1)
+        low += span
+
+
+def _validar(lower, upper, segment_size):
+    if segment_size < 1:
+        raise ValueError("El tamaño de segmento debe ser positivo")
+    return max(lower, 2), upper
+
+
+def primes_between(lower, upper, segment_size=SEGMENT_SIZE):
+    """
+    Genera los primos de [lower, upper] en orden creciente.
+    La memoria usada es O(sqrt(upper) + segment_size), independiente
+    del tamaño del intervalo.
+    """
+    lower, upper = _validar(lower, upper, segment_size)
+    if upper < lower:
+        return
+    if lower == 2:
+        yield 2
+    primes = base_primes(math.isqrt(upper))[1:]
+    for low, high in _segmentos(lower, upper, segment_size):
+        yield from compress(range(low, high, 2), sieve_segment(low, high, primes))
+
+
+def count_primes(lower, upper, segment_size=SEGMENT_SIZE):
+    """Cuenta los primos de [lower, upper] sin materializarlos."""
+    lower, upper = _validar(lower, upper, segment_size)
+    if upper < lower:
+        return 0
+    total = 1 if lower == 2 else 0
+    primes = base_primes(math.isqrt(upper))[1:]
+    for low, high in _segmentos(lower, upper, segment_size):
+        total += sieve_segment(low, high, primes).count(1)
+    return total
+
+
+# --- Modo paralelo ---------------------------------------------------------
+
+# Primos base del proceso trabajador: se reciben una sola vez al iniciar
+# el proceso (initializer) y se reutilizan en todas sus tareas.
+_primos_worker = None
+
+
+def _iniciar_worker(primes):
+    global _primos_worker
+    _primos_worker = primes
+
+
+def _cribar_bloque(low, high, segment_size, contar):
+    """
+    Criba [low, high) de a segmentos dentro del trabajador.
+    Retorna la cantidad de primos o, si contar es False, los flags
+    concatenados de los impares (range(low, high, 2)).
+    """
+    total = 0
+    partes = []
+    for seg_low, seg_high in _segmentos(low, high - 1, segment_size):
+        flags = sieve_segment(seg_low, seg_high, _primos_worker)
+        if contar:
+            total += flags.count(1)
+        else:
+            partes.append(flags)
+    return total if contar else b"".join(partes)
+
+
+def _cribar_en_paralelo(lower, upper, workers, segment_size, contar):
+    """
+    Reparte [lower, upper] en bloques entre procesos y genera
+    (low, high, resultado) en orden. Se mantienen a lo sumo 2 * workers
+    bloques en vuelo, así la memoria no depende del tamaño del intervalo.
+    """
+    workers = workers or os.cpu_count() or 1
+    primes = base_primes(math.isqrt(upper))[1:]
+    executor = ProcessPoolExecutor(workers, initializer=_iniciar_worker,
+                                   initargs=(primes,))
+    pendientes = deque()
+    try:
+        for low, high in _segmentos(lower, upper, segment_size * SEGMENTS_PER_TASK):
+            futuro = executor.submit(_cribar_bloque, low, high, segment_size, contar)
+            pendientes.append((low, high, futuro))
+            if len(pendientes) >= 2 * workers:
+                low, high, futuro = pendientes.popleft()
+                yield low, high, futuro.result()
+        while pendientes:
+            low, high, futuro = pendientes.popleft()
+            yield low, high, futuro.result()
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
+def parallel_primes(lower, upper, workers=None, segment_size=SEGMENT_SIZE):
+    """
+    Igual que primes_between pero cribando en `workers` procesos.
+    Los primos se generan en orden creciente a medida que llegan los bloques.
+    """
+    lower, upper = _validar(lower, upper, segment_size)
+    if upper < lower:
+        return
+    if lower == 2:
+        yield 2
+    for low, high, flags in _cribar_en_paralelo(lower, upper, workers,
+                                                segment_size, False):
+        yield from compress(range(low, high, 2), flags)
+
+
+def parallel_segment_counts(lower, upper, workers=None, segment_size=SEGMENT_SIZE):
+    """
+    Genera (low, high, cantidad) por bloque, con la cantidad de primos
+    de [low, high) sin materializarlos. El 2 se cuenta en el primer bloque.
+    """
+    lower, upper = _validar(lower, upper, segment_size)
+    if upper < lower:
+        return
+    extra = 1 if lower == 2 else 0
+    for low, high, cantidad in _cribar_en_paralelo(lower, upper, workers,
+                                                   segment_size, True):
+        yield low, high, cantidad + extra
+        extra = 0
+    if extra:  # intervalo [2, 2]: no hay impares que cribar
+        yield 2, 3, extra
+
+
+def parallel_count(lower, upper, workers=None, segment_size=SEGMENT_SIZE):
+    """Cuenta los primos de [lower, upper] en `workers` procesos."""
+    return sum(cantidad for _, _, cantidad in
+               parallel_segment_counts(lower, upper, workers, segment_size))
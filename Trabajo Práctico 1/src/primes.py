@@ -1,16 +1,47 @@
 #!/usr/bin/python3
 # Python program to display all the prime numbers within an interval
+import argparse
+import math
+
+from primality import is_prime
+from prime_sieve import (SEGMENT_SIZE, count_primes, parallel_count,
+                         parallel_primes, primes_between)
 
 lower = 1 #comentario para TP1: inferior = 1
 upper = 500 #comentario para TP1: superior = 500
 
-print("Prime numbers between", lower, "and", upper, "are:")
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Primos en un intervalo")
+    parser.add_argument("lower", nargs="?", type=int, default=lower)
+    parser.add_argument("upper", nargs="?", type=int, default=upper)
+    parser.add_argument("--segment-size", type=int, default=SEGMENT_SIZE,
+                        help="bytes por segmento de la criba")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="procesos para cribar (0 = todos los núcleos)")
+    parser.add_argument("--count", action="store_true",
+                        help="sólo informar la cantidad de primos")
+    args = parser.parse_args()
+
+    # --workers 1 criba en este mismo proceso; cualquier otro valor reparte
+    # los segmentos en un pool de procesos.
+    paralelo = args.workers != 1
+    workers = args.workers or None
 
-for num in range(lower, upper + 1):
-   # all prime numbers are greater than 1
-   if num > 1:
-       for i in range(2, num):
-           if (num % i) == 0:
-               break
-       else:
-           print(num)
+    if args.count:
+        if paralelo:
+            total = parallel_count(args.lower, args.upper, workers, args.segment_size)
+        else:
+            total = count_primes(args.lower, args.upper, args.segment_size)
+        print("Number of primes between", args.lower, "and", args.upper, "is:", total)
+    else:
+        if paralelo:
+            primos = parallel_primes(args.lower, args.upper, workers, args.segment_size)
+        elif args.upper - args.lower < math.isqrt(max(args.upper, 0)):
+            # Ventana angosta cerca de un número grande: cribar exigiría todos
+            # los primos hasta sqrt(upper), es más barato testear uno por uno.
+            primos = filter(is_prime, range(args.lower, args.upper + 1))
+        else:
+            primos = primes_between(args.lower, args.upper, args.segment_size)
+        print("Prime numbers between", args.lower, "and", args.upper, "are:")
+        for num in primos:
+            print(num)
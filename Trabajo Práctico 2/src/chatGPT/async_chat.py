@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# src/async_chat.py
+
+"""
+async_chat.py
+Cliente asíncrono con streaming para chat.py:
+- Una sola conexión HTTP (el pool de AsyncOpenAI) para toda la sesión.
+- Imprime los tokens a medida que llegan.
+- Cada pedido sale apenas se lee la consulta; las respuestas se imprimen
+  en orden, sin mezclarse entre sí.
+- Mide time-to-first-token y tokens por segundo.
+- Opcionalmente consulta un ResponseCache antes de llamar al API.
+- Opcionalmente envía el contexto de una Conversacion (conversation.py).
+"""
+
+import asyncio
+import time
+
+from openai import AsyncOpenAI, RateLimitError  # pylint: disable=import-error
+
+MODELO = "gpt-3.5-turbo"
+MAX_TOKENS = 50
+MOCK = "Este es un mensaje de prueba (modo mock)"
+
+
+class Metricas:
+    """Tiempos de una respuesta en streaming."""
+
+    def __init__(self):
+        self.inicio = time.perf_counter()
+        self.primer_token = None
+        self.fin = None
+        self.tokens = 0
+
+    def token(self):
+        """Registra la llegada de un token."""
+        if self.primer_token is None:
+            self.primer_token = time.perf_counter()
+        self.tokens += 1
+
+    @property
+    def ttft(self):
+        """Segundos hasta el primer token (None si no llegó ninguno)."""
+        if self.primer_token is None:
+            return None
+        return self.primer_token - self.inicio
+
+    @property
+    def tokens_por_segundo(self):
+        """Tokens recibidos por segundo, desde el primero hasta el último."""
+        if self.primer_token is None or self.fin is None or self.fin == self.primer_token:
+            return None
+        return self.tokens / (self.fin - self.primer_token)
+
+    def __str__(self):
+        ttft = f"{self.ttft * 1000:.1f} ms" if self.ttft is not None else "-"
+        tps = f"{self.tokens_por_segundo:.1f}" if self.tokens_por_segundo else "-"
+        return f"[ttft {ttft} | {self.tokens} tokens | {tps} tokens/s]"
+
+
+class AsyncChatClient:
+    """
+    Cliente de chat asíncrono. Usa un único AsyncOpenAI (y por lo tanto un
+    único pool httpx) durante toda la sesión; cerrar con aclose().
+    """
+
+    def __init__(self, api_key=None, base_url=None, model=MODELO, max_tokens=MAX_TOKENS,
+                 max_retries=2, cache=None):
+        self.client = AsyncOpenAI(api_key=api_key, base_url=base_url,
+                                  max_retries=max_retries)
+        self.model = model
+        self.max_tokens = max_tokens
+        self.cache = cache
+
+    async def completar(self, mensajes):
+        """Pedido sin streaming con la lista de mensajes dada; retorna el texto."""
+        respuesta = await self.client.chat.completions.create(
+            model=self.model,
+            messages=mensajes,
+            max_tokens=self.max_tokens
+        )
+        return respuesta.choices[0].message.content
+
+    async def stream(self, mensajes):
+        """Genera los fragmentos de texto de la respuesta a medida que llegan."""
+        respuesta = await self.client.chat.completions.create(
+            model=self.model,
+            messages=mensajes,
+            max_tokens=self.max_tokens,
+            stream=True
+        )
+        async for chunk in respuesta:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+    async def responder(self, mensaje, anterior=None, mostrar_metricas=False,
+                        conversacion=None):
+        """
+        Envía el pedido de inmediato y guarda los tokens en una cola; espera
+        a que termine `anterior` (la respuesta previa) antes de imprimir.
+        Con `conversacion`, el contexto es el de los turnos ya terminados al
+        momento de enviar, y el turno se agrega recién después de imprimirse,
+        así el historial queda en orden aunque haya pedidos solapados.
+        Retorna las Metricas de la respuesta.
+        """
+        cola = asyncio.Queue()
+        metricas = Metricas()
+
+        if conversacion is not None:
+            mensajes = conversacion.mensajes(mensaje)
+        else:
+            mensajes = [{"role": "user", "content": mensaje}]
+        guardado = self.cache.get(self.model, mensajes, self.max_tokens) if self.cache else None
+        respuesta = guardado
+
+        async def recibir():
+            nonlocal respuesta
+            if guardado is not None:
+                metricas.token()
+                await cola.put(guardado)
+                metricas.fin = time.perf_counter()
+                await cola.put(None)
+                return
+            partes = []
+            try:
+                async for texto in self.stream(mensajes):
+                    metricas.token()
+                    partes.append(texto)
+                    await cola.put(texto)
+                respuesta = "".join(partes)
+                if self.cache:
+                    self.cache.put(self.model, mensajes, self.max_tokens, respuesta)
+            except RateLimitError:
+                await cola.put(MOCK)
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                await cola.put(f"Error al invocar el API: {e}")
+            finally:
+                metricas.fin = time.perf_counter()
+                await cola.put(None)
+
+        receptor = asyncio.create_task(recibir())
+        if anterior is not None:
+            await anterior
+        print("chatGPT: ", end="", flush=True)
+        while (texto := await cola.get()) is not None:
+            print(texto, end="", flush=True)
+        print()
+        await receptor
+        if conversacion is not None and respuesta is not None:
+            conversacion.agregar_turno(mensaje, respuesta)
+        if mostrar_metricas:
+            print(metricas)
+        return metricas
+
+    async def aclose(self):
+        """Cierra el pool de conexiones."""
+        await self.client.close()
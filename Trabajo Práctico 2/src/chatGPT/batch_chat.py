@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# src/batch_chat.py
+
+"""
+batch_chat.py
+Procesamiento por lotes para chat.py (subcomando `batch`):
+- Lee prompts de un archivo JSONL ({"id": ..., "prompt": ...} o
+  {"id": ..., "messages": [...]}).
+- Los envía en paralelo, con a lo sumo `concurrencia` pedidos en vuelo.
+- Respeta límites de pedidos y tokens por minuto con token buckets.
+- Reintenta los RateLimitError con backoff exponencial con jitter.
+- Escribe cada resultado en el JSONL de salida apenas termina.
+- Las respuestas en caché se devuelven sin consumir cupo.
+"""
+
+import asyncio
+import json
+import random
+import time
+
+from openai import RateLimitError  # pylint: disable=import-error
+
+from async_chat import AsyncChatClient
+
+MAX_REINTENTOS = 6
+BACKOFF_BASE = 1.0    # segundos
+BACKOFF_MAXIMO = 60.0
+
+
+class TokenBucket:
+    """
+    Token bucket asíncrono: se recarga a `por_minuto` / 60 unidades por
+    segundo hasta `capacidad` (por defecto, lo que se recarga en 10 s, para
+    no mandar en ráfaga el límite de todo un minuto). acquire(n) espera
+    hasta poder consumir n.
+    """
+
+    def __init__(self, por_minuto, capacidad=None):
+        self.tasa = por_minuto / 60.0
+        self.capacidad = capacidad or max(1.0, por_minuto / 6)
+        self.disponible = self.capacidad
+        self.ultimo = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _recargar(self):
+        ahora = time.monotonic()
+        self.disponible = min(self.capacidad,
+                              self.disponible + (ahora - self.ultimo) * self.tasa)
+        self.ultimo = ahora
+
+    async def acquire(self, cantidad=1):
+        """Consume `cantidad` unidades, esperando lo necesario."""
+        cantidad = min(cantidad, self.capacidad)
+        async with self._lock:  # FIFO: nadie se adelanta a un pedido grande
+            self._recargar()
+            while self.disponible < cantidad:
+                await asyncio.sleep((cantidad - self.disponible) / self.tasa)
+                self._recargar()
+            self.disponible -= cantidad
+
+
+def estimar_tokens(mensajes, max_tokens):
+    """Estimación barata (≈4 caracteres por token) más los tokens de salida."""
+    return sum(len(m.get("content", "")) for m in mensajes) // 4 + max_tokens
+
+
+def backoff(intento, error=None):
+    """
+    Espera antes del reintento `intento` (0, 1, ...): exponencial con jitter
+    completo. Si el servidor envía Retry-After, se espera ese valor más el
+    jitter, para que los pedidos limitados a la vez no reintenten juntos.
+    """
+    jitter = random.uniform(0, min(BACKOFF_MAXIMO, BACKOFF_BASE * 2 ** intento))
+    respuesta = getattr(error, "response", None)
+    retry_after = respuesta.headers.get("retry-after") if respuesta is not None else None
+    if retry_after:
+        try:
+            return max(0.0, float(retry_after)) + jitter
+        except ValueError:
+            pass
+    return jitter
+
+
+def leer_prompts(path):
+    """Genera (id, mensajes) por cada línea no vacía del JSONL."""
+    with open(path, encoding="utf-8") as f:
+        for numero, linea in enumerate(f, 1):
+            if not linea.strip():
+                continue
+            registro = json.loads(linea)
+            mensajes = registro.get("messages") or [
+                {"role": "user", "content": registro["prompt"]}]
+            yield registro.get("id", numero), mensajes
+
+
+class BatchRunner:
+    """Ejecuta un lote de prompts con límites de concurrencia y de tasa."""
+
+    def __init__(self, cliente, concurrencia=16, rpm=3500, tpm=90000):
+        self.cliente = cliente
+        self.concurrencia = concurrencia
+        self.pedidos = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.ok = 0
+        self.errores = 0
+
+    async def _procesar(self, id_, mensajes):
+        inicio = time.perf_counter()
+        cache = self.cliente.cache
+        if cache:
+            # Un acierto no gasta cupo de pedidos ni de tokens.
+            texto = cache.get(self.cliente.model, mensajes, self.cliente.max_tokens)
+            if texto is not None:
+                self.ok += 1
+                return {"id": id_, "response": texto, "attempts": 0, "cached": True,
+                        "latency": round(time.perf_counter() - inicio, 3)}
+        costo = estimar_tokens(mensajes, self.cliente.max_tokens)
+        for intento in range(MAX_REINTENTOS + 1):
+            await self.pedidos.acquire()
+            await self.tokens.acquire(costo)
+            try:
+                texto = await self.cliente.completar(mensajes)
+                if cache:
+                    cache.put(self.cliente.model, mensajes, self.cliente.max_tokens, texto)
+                self.ok += 1
+                return {"id": id_, "response": texto, "attempts": intento + 1,
+                        "latency": round(time.perf_counter() - inicio, 3)}
+            except RateLimitError as e:
+                if intento == MAX_REINTENTOS:
+                    error = e
+                    break
+                await asyncio.sleep(backoff(intento, e))
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                error = e
+                break
+        self.errores += 1
+        return {"id": id_, "error": str(error), "attempts": intento + 1,
+                "latency": round(time.perf_counter() - inicio, 3)}
+
+    async def run(self, entrada, salida):
+        """Procesa el JSONL `entrada` y escribe los resultados en `salida`."""
+        semaforo = asyncio.Semaphore(self.concurrencia)
+        pendientes = set()
+        with open(salida, "w", encoding="utf-8") as out:
+
+            async def tarea(id_, mensajes):
+                try:
+                    resultado = await self._procesar(id_, mensajes)
+                    out.write(json.dumps(resultado, ensure_ascii=False) + "\n")
+                    out.flush()
+                finally:
+                    semaforo.release()
+
+            for id_, mensajes in leer_prompts(entrada):
+                # Se adquiere antes de crear la tarea: nunca hay más de
+                # `concurrencia` tareas vivas, aunque el archivo sea enorme.
+                await semaforo.acquire()
+                t = asyncio.create_task(tarea(id_, mensajes))
+                pendientes.add(t)
+                t.add_done_callback(pendientes.discard)
+            if pendientes:
+                await asyncio.gather(*pendientes)
+
+
+async def main_batch(entrada, salida, concurrencia, rpm, tpm, api_key=None, cache=None):
+    """Punto de entrada del subcomando batch."""
+    # Los reintentos los maneja BatchRunner, no el SDK.
+    cliente = AsyncChatClient(api_key=api_key, max_retries=0, cache=cache)
+    runner = BatchRunner(cliente, concurrencia, rpm, tpm)
+    inicio = time.perf_counter()
+    try:
+        await runner.run(entrada, salida)
+    finally:
+        await cliente.aclose()
+    duracion = time.perf_counter() - inicio
+    print(f"{runner.ok} respuestas, {runner.errores} errores en {duracion:.1f} s")
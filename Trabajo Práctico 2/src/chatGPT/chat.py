@@ -8,23 +8,106 @@ Script de consola para invocar al API de OpenAI Chat:
 - Añade prefijos You: / chatGPT:.
 - Maneja excepción de cuota (modo mock).
 - Soporta historial con readline.
+- Modo --stream: cliente asíncrono que imprime los tokens a medida que
+  llegan (ver async_chat.py).
+- Subcomando batch: procesa un JSONL de prompts en paralelo (ver batch_chat.py).
+- Caché de respuestas en memoria y en disco (ver response_cache.py);
+  --stats muestra los aciertos al salir.
+- Contexto de conversación con presupuesto de tokens (--context-budget,
+  0 lo deshabilita; ver conversation.py). La clave del caché incluye el
+  contexto enviado, así una respuesta guardada sólo se reutiliza para la
+  misma pregunta con los mismos turnos previos.
+- Arranque rápido: openai, dotenv, readline, asyncio y el caché se importan
+  recién cuando hacen falta (o en segundo plano mientras se espera la
+  primera consulta). --profile-startup muestra el detalle de tiempos.
 """
 
-import os
-import sys
-import readline
+import time
 
-from openai import OpenAI, RateLimitError  # pylint: disable=import-error
-from dotenv import load_dotenv  # pylint: disable=import-error
+_T0 = time.perf_counter()
 
-# 1. Carga de la API Key
-load_dotenv()
-api_key = os.getenv("OPENAI_API_KEY")
-client = OpenAI(api_key=api_key)
+import argparse  # pylint: disable=wrong-import-position
+import os  # pylint: disable=wrong-import-position
+import sys  # pylint: disable=wrong-import-position
+import threading  # pylint: disable=wrong-import-position
+
+from conversation import (PRESUPUESTO, Conversacion,  # pylint: disable=wrong-import-position
+                          resumen_extractivo)
+
+MODELO = "gpt-3.5-turbo"
+MAX_TOKENS = 50
 
 # Variable para guardar la última consulta
 _last_query = ""
 
+# API key y cliente OpenAI: se crean en la primera llamada (ver obtener_cliente)
+_api_key = None
+_client = None
+_client_lock = threading.Lock()
+
+# Caché de respuestas: None = deshabilitado. Con opciones, el ResponseCache
+# (y sqlite3) se crea en la primera consulta (ver obtener_cache).
+_cache_opciones = None
+cache = None
+
+# Contexto de la conversación (None = cada consulta va sola); se crea en __main__
+conversacion = None
+
+# Hilo de leer_consulta que quedó esperando input() (modo --stream)
+_lector = None
+
+
+def obtener_api_key():
+    """Carga el .env (una sola vez) y retorna OPENAI_API_KEY."""
+    global _api_key  # uso controlado de estado compartido
+    if _api_key is None:
+        from dotenv import load_dotenv  # pylint: disable=import-error,import-outside-toplevel
+        load_dotenv()
+        _api_key = os.getenv("OPENAI_API_KEY") or ""
+    return _api_key or None
+
+
+def obtener_cliente():
+    """Retorna el cliente OpenAI, importando el SDK y creándolo la primera vez."""
+    global _client  # uso controlado de estado compartido
+    with _client_lock:
+        if _client is None:
+            from openai import OpenAI  # pylint: disable=import-error,import-outside-toplevel
+            _client = OpenAI(api_key=obtener_api_key())
+    return _client
+
+
+def obtener_cache():
+    """Retorna el ResponseCache (creándolo la primera vez) o None si está deshabilitado."""
+    global cache  # uso controlado de estado compartido
+    if cache is None and _cache_opciones is not None:
+        from response_cache import ResponseCache  # pylint: disable=import-outside-toplevel
+        cache = ResponseCache(**_cache_opciones)
+    return cache
+
+
+def clase_cliente_async():
+    """Importa async_chat (y con él asyncio y el SDK) y retorna AsyncChatClient."""
+    from async_chat import AsyncChatClient  # pylint: disable=import-outside-toplevel
+    return AsyncChatClient
+
+
+def precargar(modo_async=False):
+    """
+    Importa el SDK y crea el cliente en un hilo de fondo, mientras el
+    usuario escribe la primera consulta.
+    """
+    def trabajo():
+        try:
+            if modo_async:
+                clase_cliente_async()
+            else:
+                obtener_cliente()
+        except Exception:  # pylint: disable=broad-exception-caught
+            pass  # el error se reporta cuando se use de verdad
+
+    threading.Thread(target=trabajo, daemon=True).start()
+
 
 def obtener_consulta():
     """
@@ -32,6 +115,8 @@ def obtener_consulta():
     la registra en el historial de readline y la devuelve.
     """
     global _last_query  # uso controlado de estado compartido
+    # readline habilita la edición y el historial de input()
+    import readline  # pylint: disable=import-outside-toplevel
     try:
         consulta = input("Ingresa tu consulta (↑ para repetir la última): ").strip()
         if not consulta:
@@ -39,7 +124,7 @@ def obtener_consulta():
         readline.add_history(consulta)
         _last_query = consulta
         return consulta
-    except (ValueError, EOFError) as e:
+    except ValueError as e:
         print(f"Error al leer la consulta: {e}")
         return None
 
@@ -61,14 +146,33 @@ def invocar_chatgpt(mensaje):
     """
     Llama al API de ChatGPT (gpt-3.5-turbo) con la consulta
     y muestra la respuesta o un mock si falla la cuota.
+    Si la misma consulta ya está en caché, no se llama al API.
+    Con contexto habilitado, envía también los turnos previos que entren
+    en el presupuesto de tokens.
     """
+    if conversacion is not None:
+        mensajes = conversacion.mensajes(mensaje)
+    else:
+        mensajes = [{"role": "user", "content": mensaje}]
+    cache = obtener_cache()
+    content = cache.get(MODELO, mensajes, MAX_TOKENS) if cache else None
+    if content is not None:
+        if conversacion is not None:
+            conversacion.agregar_turno(mensaje, content)
+        print(f"chatGPT: {content}")
+        return
+    from openai import RateLimitError  # pylint: disable=import-error,import-outside-toplevel
     try:
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[{"role": "user", "content": mensaje}],
-            max_tokens=50
+        response = obtener_cliente().chat.completions.create(
+            model=MODELO,
+            messages=mensajes,
+            max_tokens=MAX_TOKENS
         )
         content = response.choices[0].message.content
+        if cache:
+            cache.put(MODELO, mensajes, MAX_TOKENS, content)
+        if conversacion is not None:
+            conversacion.agregar_turno(mensaje, content)
     except RateLimitError:
         content = "Este es un mensaje de prueba (modo mock)"
     except Exception as e:
@@ -83,7 +187,7 @@ def main():
     - obtener_consulta()
     - procesar_consulta()
     - invocar_chatgpt()
-    - repetir hasta Ctrl+C.
+    - repetir hasta Ctrl+C o fin de la entrada.
     """
     while True:
         consulta = obtener_consulta()
@@ -96,9 +200,203 @@ def main():
         print()  # Espacio entre interacciones
 
 
+async def leer_consulta():
+    """
+    obtener_consulta() en un hilo daemon. Con asyncio.to_thread, al salir
+    con Ctrl+C asyncio.run esperaría al input() pendiente del executor; a
+    un hilo daemon nadie lo espera.
+    """
+    global _lector  # uso controlado de estado compartido
+    import asyncio  # pylint: disable=import-outside-toplevel
+    loop = asyncio.get_running_loop()
+    futuro = loop.create_future()
+
+    def resolver(consulta, error):
+        if futuro.done():
+            return
+        if error is not None:
+            futuro.set_exception(error)
+        else:
+            futuro.set_result(consulta)
+
+    def leer():
+        try:
+            consulta, error = obtener_consulta(), None
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            consulta, error = None, e  # EOFError incluido: se relanza en el loop
+        try:
+            loop.call_soon_threadsafe(resolver, consulta, error)
+        except RuntimeError:
+            pass  # el loop ya se cerró
+
+    _lector = threading.Thread(target=leer, daemon=True)
+    _lector.start()
+    return await futuro
+
+
+async def main_async(mostrar_metricas=False, primera=None):
+    """
+    Bucle principal en modo streaming: la lectura de la próxima consulta
+    corre en un hilo (ver leer_consulta) mientras las respuestas anteriores
+    siguen llegando.
+    `primera` es la consulta leída antes de arrancar el event loop.
+    """
+    import asyncio  # pylint: disable=import-outside-toplevel
+
+    cliente = clase_cliente_async()(api_key=obtener_api_key(), model=MODELO,
+                                    max_tokens=MAX_TOKENS, cache=obtener_cache())
+    anterior = None
+    consulta = primera
+    try:
+        while True:
+            if consulta is None:
+                try:
+                    consulta = await leer_consulta()
+                except EOFError:
+                    break
+            if not consulta:
+                consulta = None
+                continue
+            mensaje = procesar_consulta(consulta)
+            consulta = None
+            if not mensaje:
+                continue
+            anterior = asyncio.create_task(
+                cliente.responder(mensaje, anterior, mostrar_metricas, conversacion))
+    finally:
+        if anterior is not None:
+            await anterior
+        await cliente.aclose()
+
+
+def perfil_arranque(t_prompt):
+    """
+    Imprime el detalle de tiempos de arranque: lo que paga chat.py antes
+    del prompt, lo que se difiere hasta la primera llamada y, con
+    `python -X importtime`, los paquetes más pesados de esas etapas.
+    """
+    import importlib  # pylint: disable=import-outside-toplevel
+    import subprocess  # pylint: disable=import-outside-toplevel
+
+    print(f"{'Etapa':<44}{'ms':>9}")
+    print(f"{'chat.py hasta el prompt (en proceso)':<44}{t_prompt * 1000:>9.1f}")
+    etapas = (
+        ("import asyncio (--stream / batch)", lambda: importlib.import_module("asyncio")),
+        ("import readline (primera consulta)", lambda: importlib.import_module("readline")),
+        ("dotenv + .env (primera llamada)", obtener_api_key),
+        ("import openai (primera llamada)", lambda: importlib.import_module("openai")),
+        ("cliente OpenAI (primera llamada)", obtener_cliente),
+        ("import response_cache (primera consulta)",
+         lambda: importlib.import_module("response_cache")),
+    )
+    for nombre, etapa in etapas:
+        inicio = time.perf_counter()
+        try:
+            etapa()
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            nombre = f"{nombre} [error: {e}]"
+        print(f"{nombre:<44}{(time.perf_counter() - inicio) * 1000:>9.1f}")
+
+    inicio = time.perf_counter()
+    subprocess.run([sys.executable, __file__, "--help"], capture_output=True, check=False)
+    total = (time.perf_counter() - inicio) * 1000
+    vacio = time.perf_counter()
+    subprocess.run([sys.executable, "-c", "pass"], capture_output=True, check=False)
+    base = (time.perf_counter() - vacio) * 1000
+    print(f"\nProceso completo hasta el prompt: {total:.1f} ms "
+          f"(intérprete vacío: {base:.1f} ms, objetivo: < 50 ms)")
+
+    diferidos = ("asyncio", "readline", "response_cache", "dotenv", "openai")
+    r = subprocess.run([sys.executable, "-X", "importtime", "-c",
+                        "import " + ", ".join(diferidos)],
+                       capture_output=True, text=True, check=False)
+    paquetes = []
+    for linea in r.stderr.splitlines():
+        partes = linea.split("|")
+        if len(partes) == 3 and partes[2].strip() in diferidos and partes[1].strip().isdigit():
+            paquetes.append((int(partes[1]), partes[2].strip()))
+    print("\nImports diferidos (-X importtime, acumulado):")
+    for micro, nombre in sorted(paquetes, reverse=True):
+        print(f"  {nombre:<40}{micro / 1000:>9.1f} ms")
+
+
+def parse_args(argv=None):
+    """Opciones de línea de comandos."""
+    parser = argparse.ArgumentParser(description="Consola para el API de OpenAI Chat")
+    parser.add_argument("--stream", action="store_true",
+                        help="cliente asíncrono con streaming de tokens")
+    parser.add_argument("--metrics", action="store_true",
+                        help="con --stream, muestra time-to-first-token y tokens/s")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="no usar el caché de respuestas")
+    parser.add_argument("--cache-path",
+                        help="archivo SQLite del caché (por defecto ~/.chat_cache.sqlite3)")
+    parser.add_argument("--cache-ttl", type=float,
+                        help="vigencia de las respuestas en caché, en segundos (por defecto 7 días)")
+    parser.add_argument("--cache-max", type=int,
+                        help="respuestas guardadas en disco como máximo "
+                             "(por defecto response_cache.MAX_ENTRADAS)")
+    parser.add_argument("--stats", action="store_true",
+                        help="muestra las estadísticas del caché al salir")
+    parser.add_argument("--context-budget", type=int, default=PRESUPUESTO,
+                        help=f"tokens de contexto por pedido (por defecto {PRESUPUESTO}; "
+                             f"0: cada consulta va sola)")
+    parser.add_argument("--summarize", action="store_true",
+                        help="resumir los turnos descartados en vez de olvidarlos")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="muestra el detalle de tiempos de arranque y sale")
+    sub = parser.add_subparsers(dest="comando")
+    batch = sub.add_parser("batch", help="procesa un JSONL de prompts en paralelo")
+    batch.add_argument("entrada", help="JSONL con {id, prompt} o {id, messages}")
+    batch.add_argument("salida", help="JSONL donde se escriben los resultados")
+    batch.add_argument("--concurrency", type=int, default=16,
+                       help="pedidos en vuelo a la vez")
+    batch.add_argument("--rpm", type=int, default=3500, help="pedidos por minuto")
+    batch.add_argument("--tpm", type=int, default=90000, help="tokens por minuto")
+    return parser.parse_args(argv)
+
+
 if __name__ == "__main__":
+    args = parse_args()
+    if args.profile_startup:
+        perfil_arranque(time.perf_counter() - _T0)
+        sys.exit(0)
+    if not args.no_cache:
+        _cache_opciones = {}
+        if args.cache_path:
+            _cache_opciones["path"] = args.cache_path
+        if args.cache_ttl is not None:
+            _cache_opciones["ttl"] = args.cache_ttl
+        if args.cache_max is not None:
+            _cache_opciones["max_entradas"] = args.cache_max
+    if args.context_budget > 0:
+        conversacion = Conversacion(args.context_budget,
+                                    resumidor=resumen_extractivo if args.summarize else None)
     try:
-        main()
-    except KeyboardInterrupt:
+        if args.comando == "batch":
+            import asyncio
+            from batch_chat import main_batch
+            asyncio.run(main_batch(args.entrada, args.salida, args.concurrency,
+                                   args.rpm, args.tpm, obtener_api_key(), obtener_cache()))
+        elif args.stream:
+            # La primera consulta se lee antes de arrancar asyncio, mientras
+            # el SDK se importa en segundo plano.
+            precargar(modo_async=True)
+            primera = obtener_consulta()
+            import asyncio
+            asyncio.run(main_async(args.metrics, primera or ""))
+        else:
+            precargar()
+            main()
+    except (KeyboardInterrupt, EOFError):
         print("\nPrograma terminado por el usuario.")
-        sys.exit(0)
\ No newline at end of file
+    finally:
+        if cache:
+            if args.stats:
+                print(cache.resumen())
+            cache.close()
+    if _lector is not None and _lector.is_alive():
+        # Con stdin redirigido, el hilo bloqueado en input() tiene el lock
+        # de sys.stdin y la finalización del intérprete abortaría al pedirlo.
+        sys.stdout.flush()
+        os._exit(0)
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# src/conversation.py
+
+"""
+conversation.py
+Contexto de conversación para chat.py:
+- Guarda los turnos (pregunta, respuesta) en orden.
+- Estima los tokens de cada mensaje una sola vez, al agregarlo, y lleva
+  el total acumulado: no se re-tokeniza el historial en cada turno.
+- Descarta (o resume) los turnos más viejos para no superar el presupuesto.
+"""
+
+from collections import deque
+
+PRESUPUESTO = 2000       # tokens de contexto por pedido
+TOKENS_POR_MENSAJE = 4   # costo fijo de rol y separadores en el formato de chat
+LARGO_RESUMEN = 400      # caracteres máximos de resumen_extractivo
+
+
+def estimar_tokens(texto):
+    """Estimación barata: ≈4 caracteres por token más el costo del mensaje."""
+    return len(texto) // 4 + TOKENS_POR_MENSAJE
+
+
+def resumen_extractivo(resumen, descartados):
+    """
+    Resumidor sin llamadas al API: agrega el comienzo de cada pregunta
+    descartada al resumen y conserva los últimos LARGO_RESUMEN caracteres.
+    """
+    temas = [m["content"][:80] for m in descartados if m["role"] == "user"]
+    texto = "; ".join(filter(None, [resumen, *temas]))
+    return texto[-LARGO_RESUMEN:]
+
+
+class Conversacion:
+    """
+    Historial con presupuesto de tokens. Cada turno (pregunta y respuesta
+    juntas) entra y sale una sola vez de la deque, así que el mantenimiento
+    por turno es O(1) amortizado.
+    """
+
+    def __init__(self, presupuesto=PRESUPUESTO, sistema=None, resumidor=None):
+        self.presupuesto = presupuesto
+        self.resumidor = resumidor
+        self._sistema = {"role": "system", "content": sistema} if sistema else None
+        self._fijos = estimar_tokens(sistema) if sistema else 0
+        self._turnos = deque()  # ((pregunta, respuesta), tokens)
+        self._tokens = 0
+        self._resumen = ""
+        self._tokens_resumen = 0
+
+    @property
+    def tokens(self):
+        """Tokens estimados del contexto actual (sistema + resumen + turnos)."""
+        return self._fijos + self._tokens_resumen + self._tokens
+
+    def _recortar(self, extra=0):
+        """Saca turnos viejos hasta que el contexto más `extra` entre en el presupuesto."""
+        descartados = []
+        while self._turnos and self.tokens + extra > self.presupuesto:
+            par, tokens = self._turnos.popleft()
+            self._tokens -= tokens
+            descartados.extend(par)
+        if descartados and self.resumidor:
+            self._resumen = self.resumidor(self._resumen, descartados)
+            self._tokens_resumen = estimar_tokens(self._resumen) if self._resumen else 0
+
+    def agregar_turno(self, pregunta, respuesta):
+        """Registra una pregunta del usuario y la respuesta obtenida."""
+        par = ({"role": "user", "content": pregunta},
+               {"role": "assistant", "content": respuesta})
+        tokens = estimar_tokens(pregunta) + estimar_tokens(respuesta)
+        self._turnos.append((par, tokens))
+        self._tokens += tokens
+        self._recortar()
+
+    def mensajes(self, pendiente=None):
+        """
+        Lista de mensajes a enviar: sistema, resumen, turnos que entran en
+        el presupuesto y, si se indica, la nueva pregunta `pendiente`.
+        """
+        extra = estimar_tokens(pendiente) if pendiente is not None else 0
+        self._recortar(extra)
+        salida = []
+        if self._sistema:
+            salida.append(self._sistema)
+        if self._resumen:
+            salida.append({"role": "system",
+                           "content": f"Resumen de la conversación previa: {self._resumen}"})
+        for par, _ in self._turnos:
+            salida.extend(par)
+        if pendiente is not None:
+            salida.append({"role": "user", "content": pendiente})
+        return salida
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# src/response_cache.py
+
+"""
+response_cache.py
+Caché de respuestas para chat.py:
+- Clave: SHA-256 de (modelo, mensajes normalizados, max_tokens).
+- Nivel en memoria (LRU) para la sesión actual.
+- Nivel en disco (SQLite) con TTL y desalojo LRU por cantidad de entradas.
+  Las escrituras se confirman de a COMMIT_CADA (y al cerrar) y el desalojo
+  corre sólo al pasar el tope con HOLGURA, no en cada put.
+- Estadísticas de hits/misses para el resumen de --stats.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from collections import OrderedDict
+
+RUTA = os.path.expanduser("~/.chat_cache.sqlite3")
+TTL = 7 * 24 * 3600        # segundos
+MAX_ENTRADAS = 1_000_000   # en disco
+MAX_MEMORIA = 256          # en memoria
+COMMIT_CADA = 256          # escrituras por commit
+HOLGURA = 1.1              # se desaloja al superar max_entradas * HOLGURA
+
+
+def normalizar(texto):
+    """Minúsculas y espacios colapsados: 'Hola  Mundo ' == 'hola mundo'."""
+    return " ".join(texto.split()).casefold()
+
+
+def clave(modelo, mensajes, max_tokens):
+    """Hash estable de (modelo, mensajes normalizados, max_tokens)."""
+    normalizados = [[m.get("role", ""), normalizar(m.get("content", ""))] for m in mensajes]
+    datos = json.dumps([modelo, normalizados, max_tokens], ensure_ascii=False)
+    return hashlib.sha256(datos.encode()).hexdigest()
+
+
+class ResponseCache:
+    """Caché de dos niveles (memoria + SQLite) de respuestas del API."""
+
+    def __init__(self, path=RUTA, ttl=TTL, max_entradas=MAX_ENTRADAS, max_memoria=MAX_MEMORIA):
+        self.ttl = ttl
+        self.max_entradas = max_entradas
+        self.max_memoria = max_memoria
+        self._memoria = OrderedDict()  # clave -> (respuesta, creado)
+        self.hits_memoria = 0
+        self.hits_disco = 0
+        self.misses = 0
+        self._pendientes = 0  # escrituras sin commit
+        self._db = sqlite3.connect(path)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS respuestas ("
+            " clave TEXT PRIMARY KEY, respuesta TEXT NOT NULL,"
+            " creado REAL NOT NULL, usado REAL NOT NULL)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_usado ON respuestas (usado)")
+        self._db.execute("DELETE FROM respuestas WHERE creado < ?", (time.time() - ttl,))
+        self._db.commit()
+        # Cota superior de las filas: cuenta cada put, aunque reemplace una
+        # fila; se recalcula al desalojar.
+        self._entradas = self._db.execute("SELECT COUNT(*) FROM respuestas").fetchone()[0]
+
+    def _recordar(self, k, respuesta, creado):
+        self._memoria[k] = (respuesta, creado)
+        self._memoria.move_to_end(k)
+        if len(self._memoria) > self.max_memoria:
+            self._memoria.popitem(last=False)
+
+    def get(self, modelo, mensajes, max_tokens):
+        """Retorna la respuesta guardada o None si no hay (o venció)."""
+        k = clave(modelo, mensajes, max_tokens)
+        ahora = time.time()
+        en_memoria = self._memoria.get(k)
+        if en_memoria is not None and ahora - en_memoria[1] <= self.ttl:
+            self._memoria.move_to_end(k)
+            self.hits_memoria += 1
+            return en_memoria[0]
+
+        fila = self._db.execute(
+            "SELECT respuesta, creado FROM respuestas WHERE clave = ?", (k,)).fetchone()
+        if fila is None or ahora - fila[1] > self.ttl:
+            self._memoria.pop(k, None)
+            self.misses += 1
+            return None
+        self._db.execute("UPDATE respuestas SET usado = ? WHERE clave = ?", (ahora, k))
+        self._escrito()
+        self._recordar(k, fila[0], fila[1])
+        self.hits_disco += 1
+        return fila[0]
+
+    def _escrito(self):
+        """Cuenta una escritura y confirma la transacción cada COMMIT_CADA."""
+        self._pendientes += 1
+        if self._pendientes >= COMMIT_CADA:
+            self.flush()
+
+    def flush(self):
+        """Confirma las escrituras pendientes."""
+        if self._pendientes:
+            self._db.commit()
+            self._pendientes = 0
+
+    def put(self, modelo, mensajes, max_tokens, respuesta):
+        """
+        Guarda la respuesta (las vacías no) y, si se superó el tope con
+        holgura, desaloja las menos usadas hasta volver a max_entradas.
+        """
+        if not respuesta:
+            return
+        k = clave(modelo, mensajes, max_tokens)
+        ahora = time.time()
+        self._recordar(k, respuesta, ahora)
+        self._db.execute(
+            "INSERT OR REPLACE INTO respuestas (clave, respuesta, creado, usado)"
+            " VALUES (?, ?, ?, ?)", (k, respuesta, ahora, ahora))
+        self._entradas += 1
+        if self._entradas > self.max_entradas * HOLGURA:
+            self._db.execute(
+                "DELETE FROM respuestas WHERE clave IN (SELECT clave FROM respuestas"
+                " ORDER BY usado DESC LIMIT -1 OFFSET ?)", (self.max_entradas,))
+            self._entradas = self._db.execute("SELECT COUNT(*) FROM respuestas").fetchone()[0]
+        self._escrito()
+
+    def resumen(self):
+        """Texto con las estadísticas de la sesión."""
+        total = self.hits_memoria + self.hits_disco + self.misses
+        tasa = (self.hits_memoria + self.hits_disco) / total * 100 if total else 0.0
+        return (f"Caché: {self.hits_memoria} hits en memoria, {self.hits_disco} hits en disco, "
+                f"{self.misses} misses ({tasa:.1f}% de aciertos)")
+
+    def close(self):
+        """Confirma lo pendiente y cierra la base de datos."""
+        self.flush()
+        self._db.close()
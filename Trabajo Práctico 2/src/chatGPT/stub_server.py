@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# src/stub_server.py
+
+"""
+stub_server.py
+Servidor HTTP local que imita el endpoint /v1/chat/completions del API
+de OpenAI, para probar chat.py sin red:
+- Responde con eco de la consulta, una palabra por token.
+- Soporta stream=True (Server-Sent Events) y respuestas completas.
+- HTTP/1.1 con keep-alive, así se puede verificar la reutilización
+  de la conexión.
+- Con --rpm simula el límite de pedidos por minuto: responde 429 con
+  Retry-After (los segundos hasta que se libera un lugar) cuando se supera.
+
+Uso:
+    python stub_server.py --port 8000 --delay 0.02
+    OPENAI_BASE_URL=http://127.0.0.1:8000/v1 OPENAI_API_KEY=stub python chat.py --stream
+"""
+
+import argparse
+import json
+import math
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Atiende POST /v1/chat/completions con una respuesta de eco."""
+
+    protocol_version = "HTTP/1.1"
+    delay = 0.0  # segundos entre tokens
+    rpm = 0      # pedidos por minuto permitidos (0 = sin límite)
+    _pedidos = deque()
+    _lock = threading.Lock()
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        """Silencia el log por pedido para no ensuciar las mediciones."""
+
+    def _enviar_json(self, status, cuerpo):
+        datos = json.dumps(cuerpo).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(datos)))
+        self.end_headers()
+        self.wfile.write(datos)
+
+    def _limitado(self):
+        """
+        Segundos hasta que el pedido más viejo salga de la ventana de 60 s
+        si el pedido supera el límite por minuto; 0 si puede atenderse.
+        """
+        if not self.rpm:
+            return 0
+        ahora = time.monotonic()
+        with self._lock:
+            while self._pedidos and ahora - self._pedidos[0] > 60:
+                self._pedidos.popleft()
+            if len(self._pedidos) >= self.rpm:
+                return max(1, math.ceil(60 - (ahora - self._pedidos[0])))
+            self._pedidos.append(ahora)
+            return 0
+
+    def _enviar_chunk(self, datos):
+        """Escribe un chunk de Transfer-Encoding: chunked."""
+        self.wfile.write(f"{len(datos):x}\r\n".encode() + datos + b"\r\n")
+        self.wfile.flush()
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        """Responde al pedido de completions."""
+        if not self.path.endswith("/chat/completions"):
+            self._enviar_json(404, {"error": {"message": "not found"}})
+            return
+        largo = int(self.headers.get("Content-Length", 0))
+        pedido = json.loads(self.rfile.read(largo) or b"{}")
+        espera = self._limitado()
+        if espera:
+            datos = json.dumps({"error": {"message": "Rate limit reached",
+                                          "type": "requests", "code": "rate_limit_exceeded"}}).encode()
+            self.send_response(429)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(datos)))
+            self.send_header("Retry-After", str(espera))
+            self.end_headers()
+            self.wfile.write(datos)
+            return
+        modelo = pedido.get("model", "stub")
+        texto = pedido.get("messages", [{}])[-1].get("content", "")
+        tokens = [f"{p} " for p in texto.split()][:pedido.get("max_tokens") or None]
+
+        if not pedido.get("stream"):
+            time.sleep(self.delay * len(tokens))
+            self._enviar_json(200, {
+                "id": "stub", "object": "chat.completion", "created": int(time.time()),
+                "model": modelo,
+                "choices": [{"index": 0, "finish_reason": "stop",
+                             "message": {"role": "assistant", "content": "".join(tokens)}}],
+                "usage": {"prompt_tokens": len(texto.split()),
+                          "completion_tokens": len(tokens),
+                          "total_tokens": len(texto.split()) + len(tokens)},
+            })
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for i, token in enumerate(tokens + [None]):
+            if i:
+                time.sleep(self.delay)
+            chunk = {
+                "id": "stub", "object": "chat.completion.chunk", "created": int(time.time()),
+                "model": modelo,
+                "choices": [{"index": 0,
+                             "delta": {"content": token} if token else {},
+                             "finish_reason": None if token else "stop"}],
+            }
+            self._enviar_chunk(f"data: {json.dumps(chunk)}\n\n".encode())
+        self._enviar_chunk(b"data: [DONE]\n\n")
+        self._enviar_chunk(b"")
+
+
+def servir(port=8000, delay=0.0, rpm=0):
+    """Crea el servidor (sin arrancarlo) en 127.0.0.1:port."""
+    handler = type("Handler", (StubHandler,), {"delay": delay, "rpm": rpm,
+                                               "_pedidos": deque()})
+    return ThreadingHTTPServer(("127.0.0.1", port), handler)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stub local del API de chat")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--delay", type=float, default=0.0,
+                        help="segundos entre tokens")
+    parser.add_argument("--rpm", type=int, default=0,
+                        help="pedidos por minuto antes de responder 429")
+    args = parser.parse_args()
+    servidor = servir(args.port, args.delay, args.rpm)
+    print(f"Stub escuchando en http://127.0.0.1:{args.port}/v1")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        servidor.server_close()
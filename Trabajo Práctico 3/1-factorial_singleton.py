@@ -2,22 +2,109 @@
 # Patrones de Creación – Singleton
 # Unica instancia que calcula factorial
 
+import bisect
+import sys
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+# El cálculo se delega al motor compartido del TP1.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "Trabajo Práctico 1" / "src" / "factorial"))
+import factorial_engine  # pylint: disable=wrong-import-position
+
 class FactorialCalculator:
+    """
+    Singleton thread-safe con caché de checkpoints: guarda k! para k
+    múltiplo de PASO y calcula cualquier n desde el checkpoint más cercano
+    por debajo. Los checkpoints se descartan por LRU cuando su tamaño total
+    supera MAX_BYTES.
+    """
+    PASO = 64
+    MAX_BYTES = 64 * 1024 * 1024
+
     _instance = None
+    _instance_lock = threading.Lock()
 
     def __new__(cls):
         if cls._instance is None:
-            cls._instance = super().__new__(cls)
+            with cls._instance_lock:
+                if cls._instance is None:  # otro hilo pudo crearla mientras esperábamos
+                    instancia = super().__new__(cls)
+                    instancia._lock = threading.Lock()
+                    instancia._cache = OrderedDict()  # k -> k!, en orden de uso
+                    instancia._claves = []            # los mismos k, ordenados
+                    instancia._bytes = 0
+                    instancia.hits = 0
+                    instancia.misses = 0
+                    cls._instance = instancia
         return cls._instance
 
+    def _checkpoint_cercano(self, n, k):
+        """
+        Retorna (c, c!) con el mayor c <= n en caché, o (0, 1). Cuenta un
+        hit sólo si se devuelve un checkpoint guardado y es el k que
+        corresponde a n; (0, 1) cuenta siempre como miss.
+        """
+        with self._lock:
+            i = bisect.bisect_right(self._claves, n)
+            if i == 0:
+                self.misses += 1
+                return 0, 1
+            c = self._claves[i - 1]
+            self._cache.move_to_end(c)
+            if c == k:
+                self.hits += 1
+            else:
+                self.misses += 1
+            return c, self._cache[c]
+
+    def _guardar(self, k, valor):
+        tamaño = (valor.bit_length() + 7) // 8
+        if tamaño > self.MAX_BYTES:
+            return
+        with self._lock:
+            if k in self._cache:
+                return
+            self._cache[k] = valor
+            bisect.insort(self._claves, k)
+            self._bytes += tamaño
+            while self._bytes > self.MAX_BYTES:
+                viejo, v = self._cache.popitem(last=False)
+                self._claves.remove(viejo)
+                self._bytes -= (v.bit_length() + 7) // 8
+
     def factorial(self, n: int) -> int:
         """Calcula el factorial de n (n!). Lanza ValueError si n < 0."""
         if n < 0:
             raise ValueError("El factorial no está definido para n < 0")
-        resultado = 1
-        for i in range(2, n+1):
-            resultado *= i
-        return resultado
+        k = n - n % self.PASO
+        c, valor = self._checkpoint_cercano(n, k)
+        if c != k:
+            # Falta el checkpoint k: se arma desde el más cercano y se guarda.
+            # Dos hilos pueden calcular el mismo k a la vez; el resultado es
+            # idéntico y _guardar conserva sólo uno.
+            if c == 0:
+                valor = factorial_engine.factorial(k)
+            else:
+                valor *= factorial_engine.product_range(c + 1, k)
+            self._guardar(k, valor)
+        return valor * factorial_engine.product_range(k + 1, n)
+
+    def factorial_mod(self, n: int, p: int) -> int:
+        """n! mod p para p primo (Wilson + productos por bloques)."""
+        return factorial_engine.factorial_mod(n, p)
+
+    def factorial_mod_many(self, consultas) -> list:
+        """factorial_mod para muchas consultas (n, p) en un solo barrido por primo."""
+        return factorial_engine.factorial_mod_many(consultas)
+
+    def binomial_mod(self, n, k, p):
+        """C(n, k) mod p para p primo; n y k pueden ser arrays NumPy."""
+        return factorial_engine.binomial_mod(n, k, p)
+
+    def bytes_en_cache(self) -> int:
+        """Tamaño total (en bytes) de los checkpoints guardados."""
+        return self._bytes
 
 # Ejemplo rápido
 if __name__ == "__main__":
@@ -26,3 +113,4 @@ if __name__ == "__main__":
     print(f1 is f2)            # True: misma instancia
     print(f1.factorial(5))     # 120
     print(f2.factorial(0))     # 1
+    print(f1.factorial_mod(10, 13))  # 10! mod 13 = 6
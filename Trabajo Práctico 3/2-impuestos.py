@@ -1,7 +1,26 @@
 # impuestos.py
 # Cálculo de IVA (21%), IIBB (5%) y contribuciones municipales (1.2%)
 
+import sys
+from pathlib import Path
+
+# Lotes y archivos se calculan con el motor vectorizado en centavos.
+from impuestos_engine import (TASAS, calcular_lote, compilar_tasas,
+                              formato_pesos, totales_archivo)
+from impuestos_tasas import RegistroTasas
+
 class Impuestos:
+    def __init__(self, tasas=None, registro=None):
+        """
+        `tasas` es un dict nombre -> tasa ("0.21", 0.21, ...); por defecto
+        IVA 21%, IIBB 5% y Municipal 1.2%. `registro` (RegistroTasas) da
+        tasas por jurisdicción y fecha para los lotes.
+        """
+        self.registro = registro
+        self.tasas = dict(TASAS if tasas is None else tasas)
+        self._compiladas = compilar_tasas(self.tasas)
+        self._factores = [float(t) for t in self.tasas.values()]
+
     def calcular(self, base: float) -> float:
         """
         Recibe base imponible y retorna base + IVA + IIBB + contribuciones.
@@ -9,12 +28,46 @@ class Impuestos:
         """
         if base < 0:
             raise ValueError("La base imponible no puede ser negativa")
-        iva = base * 0.21
-        iibb = base * 0.05
-        municip = base * 0.012
-        return base + iva + iibb + municip
+        return sum((base * t for t in self._factores), base)
+
+    def calcular_lote(self, bases, centavos=False, jurisdicciones=None, fechas=None):
+        """
+        Desglose exacto (en centavos int64) de un array de bases: columnas
+        base, cada impuesto y total. Falla si alguna base es negativa.
+        Con registro, las tasas de cada fila dependen de su jurisdicción y
+        fecha.
+        """
+        if self.registro is not None:
+            if jurisdicciones is None or fechas is None:
+                raise ValueError("Con registro de tasas hacen falta jurisdicciones y fechas")
+            return self.registro.calcular_lote(bases, jurisdicciones, fechas, centavos)
+        return calcular_lote(bases, self._compiladas, centavos=centavos)
+
+    def calcular_archivo(self, path, columna="base"):
+        """
+        Totales en centavos de un CSV o .npy, procesado por bloques. Con
+        registro, el CSV debe tener además columnas jurisdiccion y fecha.
+        """
+        return totales_archivo(path, columna, self._compiladas, registro=self.registro)
 
 # Ejemplo
 if __name__ == "__main__":
     imp = Impuestos()
     print(imp.calcular(1000.0))  # 1000 + 210 + 50 + 12 = 1272
+    if len(sys.argv) > 1:
+        # python 2-impuestos.py facturas.csv [columna]
+        totales = imp.calcular_archivo(sys.argv[1], *sys.argv[2:3])
+        print(f"{totales.pop('filas')} filas")
+        for nombre, centavos in totales.items():
+            print(f"{nombre:>10}: {formato_pesos(centavos)}")
+    else:
+        lote = imp.calcular_lote([1000.0, 2500.75, 0.99])
+        for nombre, centavos in lote.totales().items():
+            print(f"{nombre:>10}: {formato_pesos(centavos)}")
+        # Tasas por jurisdicción y fecha (el CSV se compila a tasas.csv.npz)
+        registro = RegistroTasas.cargar(Path(__file__).with_name("tasas.csv"))
+        lote = Impuestos(registro=registro).calcular_lote(
+            [1000.0, 1000.0, 1000.0], jurisdicciones=["CABA", "CABA", "Entre Rios"],
+            fechas=["2024-06-30", "2024-07-01", "2025-03-15"])
+        for fila in range(len(lote)):
+            print(f"total fila {fila}: {formato_pesos(lote.total[fila])}")
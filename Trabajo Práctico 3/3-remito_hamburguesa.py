@@ -4,36 +4,77 @@
 from abc import ABC, abstractmethod
 
 class Entrega(ABC):
+    # Las entregas no tienen estado: la fábrica comparte una instancia por modo.
+    __slots__ = ()
+
     @abstractmethod
     def enviar(self) -> str:
         pass
 
+class HamburguesaRemitoFactory:
+    """
+    Fábrica con registro: cada estrategia de entrega se registra con su modo
+    y la fábrica guarda una única instancia (flyweight) por modo. Crear una
+    entrega es una búsqueda en un dict.
+    """
+    _entregas = {}  # modo -> instancia
+    _alias = {}     # modo tal como llegó ("Delivery", ...) -> instancia; se vacía al registrar
+
+    @classmethod
+    def registrar(cls, modo: str):
+        """Decorador de clase: registra la estrategia para `modo`."""
+        def decorador(clase):
+            cls._entregas[modo.lower()] = clase()
+            cls._alias.clear()
+            return clase
+        return decorador
+
+    @classmethod
+    def modos(cls):
+        return sorted(cls._entregas)
+
+    @classmethod
+    def crear_entrega(cls, modo: str) -> Entrega:
+        try:
+            return cls._alias[modo]
+        except KeyError:
+            entrega = cls._entregas.get(modo.lower())
+            if entrega is None:
+                raise ValueError(f"Modo de entrega desconocido: {modo.lower()}") from None
+            cls._alias[modo] = entrega  # la próxima vez "Delivery" tampoco se normaliza
+            return entrega
+
+    @classmethod
+    def crear_entregas(cls, modos):
+        """Entregas para una secuencia de modos; solo se aloca la lista de salida."""
+        alias = cls._alias
+        return [alias[m] if m in alias else cls.crear_entrega(m) for m in modos]
+
+@HamburguesaRemitoFactory.registrar("mostrador")
 class EntregaMostrador(Entrega):
+    __slots__ = ()
+
     def enviar(self) -> str:
         return "Hamburguesa entregada en mostrador."
 
+@HamburguesaRemitoFactory.registrar("retiro")
 class EntregaRetiro(Entrega):
+    __slots__ = ()
+
     def enviar(self) -> str:
         return "Hamburguesa lista para retiro por el cliente."
 
+@HamburguesaRemitoFactory.registrar("delivery")
 class EntregaDelivery(Entrega):
+    __slots__ = ()
+
     def enviar(self) -> str:
         return "Hamburguesa enviada por delivery."
 
-class HamburguesaRemitoFactory:
-    @staticmethod
-    def crear_entrega(modo: str) -> Entrega:
-        modo = modo.lower()
-        if modo == "mostrador":
-            return EntregaMostrador()
-        if modo == "retiro":
-            return EntregaRetiro()
-        if modo == "delivery":
-            return EntregaDelivery()
-        raise ValueError(f"Modo de entrega desconocido: {modo}")
-
 # Ejemplo
 if __name__ == "__main__":
     for modo in ["mostrador","retiro","delivery"]:
         remito = HamburguesaRemitoFactory.crear_entrega(modo)
         print(remito.enviar())
+    remitos = HamburguesaRemitoFactory.crear_entregas(["Delivery", "retiro", "delivery"])
+    print([r.enviar() for r in remitos])
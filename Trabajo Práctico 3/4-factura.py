@@ -1,29 +1,176 @@
 # factura.py
 # Generación de factura con condición impositiva
 
+import argparse
+import io
+import os
+import sys
+import time
+import tracemalloc
+from array import array
+from enum import IntEnum
+
+# Condiciones fiscales: clave normalizada -> descripción. Es la única
+# fuente; el enum, las descripciones y la normalización salen de acá.
+CONDICIONES = {
+    "responsable": "IVA Responsable",
+    "no_inscripto": "IVA No Inscripto",
+    "exento": "IVA Exento"
+}
+
+# Condición fiscal como entero chico (un byte por factura en FacturaLote).
+Condicion = IntEnum("Condicion", [(clave.upper(), i) for i, clave in enumerate(CONDICIONES)])
+
+# Descripción de cada condición, indexada por código.
+DESCRIPCIONES = tuple(CONDICIONES.values())
+
+# Texto ya normalizado -> código; _CODIGOS cachea además cada texto crudo
+# visto, así lower().replace() corre una vez por variante y no por factura.
+_NORMALIZADOS = {clave: Condicion(i) for i, clave in enumerate(CONDICIONES)}
+_CODIGOS = {}
+
+def codigo_condicion(condicion) -> Condicion:
+    """Código de 'Responsable', 'no inscripto', 'No_Inscripto', Condicion.EXENTO, ..."""
+    try:
+        return _CODIGOS[condicion]
+    except KeyError:
+        pass
+    if isinstance(condicion, Condicion):
+        return condicion
+    clave = condicion.lower().replace(" ", "_")
+    if clave not in _NORMALIZADOS:
+        raise ValueError(f"Condición fiscal inválida: {condicion}")
+    codigo = _CODIGOS[condicion] = _NORMALIZADOS[clave]
+    return codigo
+
 class Factura:
     """
     Factura con total y condición fiscal: 'Responsable', 'No Inscripto', 'Exento'.
     """
-    CONDICIONES = {
-        "responsable": "IVA Responsable",
-        "no_inscripto": "IVA No Inscripto",
-        "exento": "IVA Exento"
-    }
+    __slots__ = ("total", "codigo")
+
+    CONDICIONES = CONDICIONES
 
     def __init__(self, total: float, condicion: str):
         if total < 0:
             raise ValueError("El total no puede ser negativo")
-        clave = condicion.lower().replace(" ", "_")
-        if clave not in self.CONDICIONES:
-            raise ValueError(f"Condición fiscal inválida: {condicion}")
         self.total = total
-        self.condicion = self.CONDICIONES[clave]
+        self.codigo = codigo_condicion(condicion)
+
+    @property
+    def condicion(self) -> str:
+        return DESCRIPCIONES[self.codigo]
 
     def __str__(self):
         return f"Factura: Total = ${self.total:.2f} | Condición: {self.condicion}"
 
+# Una plantilla % por condición: renderizar una línea es un solo formateo.
+_PLANTILLAS = tuple(f"Factura: Total = $%.2f | Condición: {d}\n" for d in DESCRIPCIONES)
+
+class FacturaLote:
+    """
+    Lote de facturas en columnas: totales en array('d') (8 bytes) y códigos
+    de condición en array('B') (1 byte), sin un objeto por factura.
+    lote[i] arma una Factura sólo cuando se la pide.
+    """
+    __slots__ = ("totales", "codigos")
+
+    def __init__(self, totales=(), condiciones=()):
+        self.totales = array("d")
+        self.codigos = array("B")
+        self.extender(totales, condiciones)
+
+    def agregar(self, total: float, condicion):
+        if total < 0:
+            raise ValueError("El total no puede ser negativo")
+        self.codigos.append(codigo_condicion(condicion))
+        self.totales.append(total)
+
+    def extender(self, totales, condiciones):
+        """Agrega muchas facturas; valida todo antes de modificar el lote."""
+        totales = array("d", totales)
+        codigos = array("B", map(codigo_condicion, condiciones))
+        if len(totales) != len(codigos):
+            raise ValueError("Totales y condiciones deben tener el mismo largo")
+        if totales and min(totales) < 0:
+            raise ValueError("El total no puede ser negativo")
+        self.totales.extend(totales)
+        self.codigos.extend(codigos)
+
+    def __len__(self):
+        return len(self.totales)
+
+    def __getitem__(self, i) -> Factura:
+        factura = Factura.__new__(Factura)
+        factura.total = self.totales[i]
+        factura.codigo = Condicion(self.codigos[i])
+        return factura
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    def bytes_por_factura(self) -> int:
+        return self.totales.itemsize + self.codigos.itemsize
+
+    def render(self, out, bloque=1 << 16):
+        """
+        Escribe una línea por factura (el mismo texto que str(Factura)) en
+        `out`, armando `bloque` líneas por cada write.
+        """
+        plantillas = _PLANTILLAS
+        totales, codigos = self.totales, self.codigos
+        for inicio in range(0, len(totales), bloque):
+            fin = inicio + bloque
+            out.write("".join([plantillas[c] % t
+                               for t, c in zip(totales[inicio:fin], codigos[inicio:fin])]))
+
+def benchmark(n: int):
+    """Memoria por factura y facturas renderizadas por segundo: objetos vs lote."""
+    condiciones = [("responsable", "No Inscripto", "exento")[i % 3] for i in range(n)]
+    totales = [(i % 100000) * 1.25 for i in range(n)]
+
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    facturas = [Factura(t, c) for t, c in zip(totales, condiciones)]
+    construir_obj = time.perf_counter() - inicio
+    mem_obj = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    lote = FacturaLote(totales, condiciones)
+    construir_lote = time.perf_counter() - inicio
+    mem_lote = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    with open(os.devnull, "w", encoding="utf-8") as nulo:
+        inicio = time.perf_counter()
+        for f in facturas:
+            print(f, file=nulo)
+        render_obj = time.perf_counter() - inicio
+        inicio = time.perf_counter()
+        lote.render(nulo)
+        render_lote = time.perf_counter() - inicio
+
+    muestra = io.StringIO()
+    FacturaLote(totales[:1000], condiciones[:1000]).render(muestra)
+    assert muestra.getvalue() == "".join(f"{f}\n" for f in facturas[:1000])
+
+    print(f"{n} facturas")
+    print(f"{'':<10}{'bytes/factura':>15}{'construcción/s':>16}{'render/s':>14}")
+    print(f"{'objetos':<10}{mem_obj / n:>15.1f}{n / construir_obj:>16,.0f}{n / render_obj:>14,.0f}")
+    print(f"{'lote':<10}{mem_lote / n:>15.1f}{n / construir_lote:>16,.0f}{n / render_lote:>14,.0f}")
+
 # Ejemplo
 if __name__ == "__main__":
-    for cond in ["responsable","no_inscripto","exento"]:
-        print(Factura(2500.75, cond))
+    parser = argparse.ArgumentParser(description="Facturas con condición impositiva")
+    parser.add_argument("--bench", type=int, metavar="N",
+                        help="compara objetos y FacturaLote con N facturas")
+    args = parser.parse_args()
+    if args.bench:
+        benchmark(args.bench)
+    else:
+        for cond in ["responsable","no_inscripto","exento"]:
+            print(Factura(2500.75, cond))
+        lote = FacturaLote([100.0, 2500.75, 99.9], ["Responsable", "No Inscripto", "exento"])
+        lote.render(sys.stdout)
@@ -1,8 +1,19 @@
 # avion_builder.py
 # Extiende Builder para armar Aviones
 
+import argparse
+import sys
+import time
+import tracemalloc
+from array import array
 from dataclasses import dataclass
-from typing import Optional, List
+from typing import Iterable, Optional, List
+
+# Valores por defecto de AvionBuilder.build y de FlotaBuilder
+BODY = "Fuselaje estándar"
+TURBINAS = 2
+ALAS = 2
+TREN = "Retráctil"
 
 @dataclass
 class Avion:
@@ -45,14 +56,143 @@ class AvionBuilder:
 
     def build(self) -> Avion:
         # valores por defecto
-        body = self._body or "Fuselaje estándar"
-        turb = self._turbinas or 2
-        alas = self._alas or 2
-        tren = self._tren or "Retráctil"
+        body = self._body or BODY
+        turb = self._turbinas or TURBINAS
+        alas = self._alas or ALAS
+        tren = self._tren or TREN
         return Avion(self._modelo, body, turb, alas, tren)
 
+class Catalogo:
+    """
+    Strings internados: cada texto distinto se guarda una vez y las columnas
+    guardan su código. None y "" se traducen al valor por defecto, igual que
+    el `or` de AvionBuilder.build.
+    """
+    __slots__ = ("textos", "_codigos")
+
+    def __init__(self, defecto: str):
+        self.textos: List[str] = []
+        self._codigos = {}
+        self._codigos[None] = self._codigos[""] = self.codigo(defecto)
+
+    def codigo(self, texto) -> int:
+        codigo = self._codigos.get(texto)
+        if codigo is None:
+            codigo = self._codigos[texto] = len(self.textos)
+            self.textos.append(sys.intern(texto))
+        return codigo
+
+    def codificar(self, textos: Iterable) -> array:
+        codigos, codigo = self._codigos, self.codigo
+        return array("I", [codigos[t] if t in codigos else codigo(t) for t in textos])
+
+class Flota:
+    """
+    Tabla de aviones en columnas (struct of arrays): modelo, body y tren
+    como códigos de Catalogo en array('I'), turbinas y alas en array('H').
+    flota[i] arma el Avion de la fila i sólo cuando se lo pide.
+    """
+    __slots__ = ("modelos", "bodies", "trenes", "modelo", "body", "turbinas", "alas", "tren")
+
+    def __init__(self):
+        self.modelos = Catalogo("")
+        self.bodies = Catalogo(BODY)
+        self.trenes = Catalogo(TREN)
+        self.modelo = array("I")
+        self.body = array("I")
+        self.turbinas = array("H")
+        self.alas = array("H")
+        self.tren = array("I")
+
+    def __len__(self):
+        return len(self.modelo)
+
+    def __getitem__(self, i) -> Avion:
+        return Avion(self.modelos.textos[self.modelo[i]], self.bodies.textos[self.body[i]],
+                     self.turbinas[i], self.alas[i], self.trenes.textos[self.tren[i]])
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    def bytes_por_avion(self) -> int:
+        return sum(getattr(self, c).itemsize
+                   for c in ("modelo", "body", "turbinas", "alas", "tren"))
+
+class FlotaBuilder:
+    """
+    Builder por lotes: recibe columnas (una secuencia por atributo, None
+    para usar el valor por defecto) y las agrega a una Flota, sin crear un
+    AvionBuilder ni un Avion por fila.
+    """
+    def __init__(self):
+        self._flota = Flota()
+
+    def agregar(self, modelo: str, body: Optional[str] = None, turbinas: Optional[int] = None,
+                alas: Optional[int] = None, tren: Optional[str] = None) -> "FlotaBuilder":
+        return self.columnas([modelo], [body], [turbinas], [alas], [tren])
+
+    def columnas(self, modelos, bodies=None, turbinas=None, alas=None, trenes=None) -> "FlotaBuilder":
+        """Agrega len(modelos) aviones; valida los largos antes de modificar la flota."""
+        f = self._flota
+        n = len(modelos)
+        nuevas = (
+            (f.modelo, f.modelos.codificar(modelos)),
+            (f.body, f.bodies.codificar(bodies if bodies is not None else [None] * n)),
+            (f.turbinas, array("H", [t or TURBINAS for t in turbinas]) if turbinas is not None
+             else array("H", [TURBINAS]) * n),
+            (f.alas, array("H", [a or ALAS for a in alas]) if alas is not None
+             else array("H", [ALAS]) * n),
+            (f.tren, f.trenes.codificar(trenes if trenes is not None else [None] * n)),
+        )
+        if any(len(col) != n for _, col in nuevas):
+            raise ValueError("Todas las columnas deben tener el mismo largo")
+        for destino, col in nuevas:
+            destino.extend(col)
+        return self
+
+    def build(self) -> Flota:
+        flota, self._flota = self._flota, Flota()
+        return flota
+
+def benchmark(n: int):
+    """Aviones construidos por segundo y memoria por avión: objetos vs columnas."""
+    modelos = [f"Modelo {i % 50}" for i in range(n)]
+    bodies = [("Fuselaje ancho", "Fuselaje angosto", None)[i % 3] for i in range(n)]
+    turbinas = [(2, 4, None)[i % 3] for i in range(n)]
+    alas = [2] * n
+    trenes = [("Fijo triple", "Retráctil", None)[i % 3] for i in range(n)]
+
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    aviones = [AvionBuilder(m).body(b).turbinas(t).alas(a).tren_aterrizaje(r).build()
+               for m, b, t, a, r in zip(modelos, bodies, turbinas, alas, trenes)]
+    t_obj = time.perf_counter() - inicio
+    mem_obj = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    flota = FlotaBuilder().columnas(modelos, bodies, turbinas, alas, trenes).build()
+    t_col = time.perf_counter() - inicio
+    mem_col = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    assert all(flota[i] == aviones[i] for i in range(0, n, max(1, n // 1000)))
+    print(f"{n} aviones")
+    print(f"{'':<10}{'aviones/s':>14}{'bytes/avión':>14}")
+    print(f"{'objetos':<10}{n / t_obj:>14,.0f}{mem_obj / n:>14.1f}")
+    print(f"{'columnas':<10}{n / t_col:>14,.0f}{mem_col / n:>14.1f}")
+
 # Ejemplo
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Builder de aviones")
+    parser.add_argument("--bench", type=int, metavar="N",
+                        help="compara AvionBuilder y FlotaBuilder con N aviones")
+    args = parser.parse_args()
+    if args.bench:
+        benchmark(args.bench)
+        sys.exit(0)
+
     boeing = (
         AvionBuilder("Boeing 747")
         .body("Fuselaje ancho")
@@ -65,3 +205,12 @@ if __name__ == "__main__":
 
     jet = AvionBuilder("Jet Privado").build()
     print(jet)
+
+    flota = (
+        FlotaBuilder()
+        .columnas(["A320", "A330", "Cessna 172"], ["Fuselaje angosto", "Fuselaje ancho", None],
+                  [2, 2, 1], [2, 2, 2], [None, None, "Fijo triciclo"])
+        .build()
+    )
+    for avion in flota:
+        print(avion)
@@ -1,7 +1,126 @@
 # prototipo.py
-# Patrón Prototype – clonación profunda
+# Patrón Prototype – clonación profunda y copy-on-write
 
+import argparse
 import copy
+import dataclasses
+import datetime
+import decimal
+import enum
+import fractions
+import time
+import types
+import uuid
+from collections.abc import Mapping, MutableMapping
+
+# Valores que se pueden compartir entre clones sin copiarlos nunca.
+_INMUTABLES = frozenset({str, int, float, complex, bool, bytes, type(None), frozenset})
+
+# Otros tipos inmutables de la biblioteca estándar, por tipo exacto (una
+# subclase podría agregar estado mutable). Sólo se consultan al registrar.
+_ATOMICOS = frozenset({datetime.date, datetime.datetime, datetime.time, datetime.timedelta,
+                       datetime.timezone, decimal.Decimal, fractions.Fraction, uuid.UUID,
+                       range, type, types.FunctionType, types.BuiltinFunctionType})
+
+def _clonar_valor(valor):
+    """Copia independiente de `valor`, compartiendo todo lo inmutable."""
+    if type(valor) in _INMUTABLES:
+        return valor
+    if isinstance(valor, Metadatos):
+        return valor.clone()
+    return copy.deepcopy(valor)
+
+class Metadatos(MutableMapping):
+    """
+    Diccionario copy-on-write: los clones comparten una base que nadie
+    modifica y cada uno guarda sólo sus propios cambios y borrados.
+    Clonar cuesta O(cambios propios), O(1) para un prototipo sin tocar.
+    Un valor mutable de la base (un dict anidado, una lista) se copia
+    recién cuando se lo lee, porque quien lo recibe puede modificarlo:
+    los dicts anidados se envuelven en otro Metadatos (se copia sólo el
+    camino tocado) y el resto se copia en profundidad.
+    """
+    __slots__ = ("_base", "_cambios", "_borrados")
+
+    def __init__(self, datos=()):
+        # Se toma una foto de `datos`: la base no puede cambiar por fuera.
+        self._base = copy.deepcopy(dict(datos))
+        self._cambios = {}
+        self._borrados = set()
+
+    @classmethod
+    def _sobre(cls, base, cambios=None, borrados=None):
+        nuevo = cls.__new__(cls)
+        nuevo._base = base
+        nuevo._cambios = cambios if cambios is not None else {}
+        nuevo._borrados = borrados if borrados is not None else set()
+        return nuevo
+
+    def __getitem__(self, clave):
+        if clave in self._cambios:
+            return self._cambios[clave]
+        if clave in self._borrados:
+            raise KeyError(clave)
+        valor = self._base[clave]
+        if type(valor) in _INMUTABLES:
+            return valor
+        valor = Metadatos._sobre(valor) if isinstance(valor, dict) else copy.deepcopy(valor)
+        self._cambios[clave] = valor
+        return valor
+
+    def __setitem__(self, clave, valor):
+        self._cambios[clave] = valor
+        self._borrados.discard(clave)
+
+    def __delitem__(self, clave):
+        if clave not in self:
+            raise KeyError(clave)
+        self._cambios.pop(clave, None)
+        if clave in self._base:
+            self._borrados.add(clave)
+
+    def __contains__(self, clave):
+        return clave in self._cambios or (clave in self._base and clave not in self._borrados)
+
+    def __iter__(self):
+        borrados, cambios = self._borrados, self._cambios
+        for clave in self._base:
+            if clave not in borrados:
+                yield clave
+        for clave in cambios:
+            if clave not in self._base:
+                yield clave
+
+    def __len__(self):
+        nuevas = sum(1 for clave in self._cambios if clave not in self._base)
+        return len(self._base) - len(self._borrados) + nuevas
+
+    def _ver(self, clave):
+        """Valor sin copiar el camino (sólo para leer, nunca se entrega afuera)."""
+        return self._cambios[clave] if clave in self._cambios else self._base[clave]
+
+    def a_dict(self) -> dict:
+        """Copia como dict común (los anidados también)."""
+        return {clave: (v.a_dict() if isinstance(v, Metadatos) else copy.deepcopy(v))
+                for clave in self for v in (self._ver(clave),)}
+
+    def clone(self) -> "Metadatos":
+        return Metadatos._sobre(self._base,
+                                {k: _clonar_valor(v) for k, v in self._cambios.items()},
+                                set(self._borrados))
+
+    def __deepcopy__(self, memo):
+        return self.clone()
+
+    def __eq__(self, otro):
+        if isinstance(otro, Metadatos):
+            return self.a_dict() == otro.a_dict()
+        if isinstance(otro, Mapping):
+            return self.a_dict() == dict(otro)
+        return NotImplemented
+
+    def __repr__(self):
+        return repr(self.a_dict())
 
 class Documento:
     def __init__(self, titulo: str, contenido: str, metadatos: dict):
@@ -9,17 +128,290 @@ class Documento:
         self.contenido = contenido
         self.metadatos = metadatos  # p.ej. autor, fecha
 
-    def clone(self) -> "Documento":
-        """Devuelve una copia profunda de sí mismo."""
-        return copy.deepcopy(self)
+    def clone(self, cow: bool = False) -> "Documento":
+        """
+        Devuelve una copia profunda de sí mismo. Con cow=True los metadatos
+        del clon son un Metadatos que se copia sólo donde el clon escribe.
+        Si los del original son un dict común se toma una foto nueva en cada
+        clon, así se ven siempre sus cambios (también los anidados); con
+        congelar() el original pasa a un Metadatos y clonar cuesta
+        O(cambios propios).
+        """
+        if not cow:
+            return copy.deepcopy(self)
+        metadatos = self.metadatos
+        if isinstance(metadatos, Metadatos):
+            compartidos = metadatos.clone()
+        else:
+            compartidos = Metadatos(metadatos)
+        nuevo = object.__new__(type(self))
+        nuevo.__dict__.update({k: _clonar_valor(v) for k, v in self.__dict__.items()
+                               if k != "metadatos"})
+        nuevo.metadatos = compartidos
+        return nuevo
+
+    def congelar(self):
+        """Convierte los metadatos en Metadatos, para que los clones COW los compartan."""
+        if not isinstance(self.metadatos, Metadatos):
+            self.metadatos = Metadatos(self.metadatos)
+        return self.metadatos
 
     def __str__(self):
         return f"Documento '{self.titulo}' con metadatos {self.metadatos}"
 
+def _es_atomico(valor) -> bool:
+    """
+    True si valor es inmutable en profundidad y se puede compartir entre
+    clones: los tipos de _INMUTABLES y _ATOMICOS, los miembros de un Enum y
+    las dataclasses congeladas cuyos campos también lo son.
+    """
+    tipo = type(valor)
+    if tipo in _INMUTABLES or tipo in _ATOMICOS or isinstance(valor, enum.Enum):
+        return True
+    parametros = getattr(tipo, "__dataclass_params__", None)
+    return (parametros is not None and parametros.frozen
+            and all(_es_atomico(getattr(valor, f.name)) for f in dataclasses.fields(valor)))
+
+def _solo_inmutables(contenedor) -> bool:
+    return all(_es_atomico(v) for v in contenedor)
+
+def _estado_visible(valor) -> bool:
+    """
+    True si deepcopy copiaría valor a partir de su __dict__: sin __reduce__,
+    __getstate__ ni __slots__ propios, así recorrer vars(valor) alcanza para
+    ver todo lo que referencia.
+    """
+    tipo = type(valor)
+    return (hasattr(valor, "__dict__")
+            and tipo.__reduce_ex__ is object.__reduce_ex__
+            and tipo.__reduce__ is object.__reduce__
+            and getattr(tipo, "__getstate__", None) is getattr(object, "__getstate__", None)
+            and not any("__slots__" in vars(c) for c in tipo.__mro__))
+
+def _copiar_arbol(valor):
+    """
+    Copia de un árbol de dicts, listas, sets y tuplas con hojas inmutables.
+    A diferencia de deepcopy no lleva memo: no admite ciclos ni referencias
+    compartidas, que es lo que valida _requiere_deepcopy al registrar.
+    """
+    tipo = type(valor)
+    if tipo in _INMUTABLES:
+        return valor
+    if tipo is dict:
+        return {k: _copiar_arbol(v) for k, v in valor.items()}
+    if tipo is list:
+        return [_copiar_arbol(v) for v in valor]
+    if tipo is tuple:
+        return tuple(_copiar_arbol(v) for v in valor)
+    if tipo is set:
+        return set(valor)  # sus elementos ya son hashables
+    return valor  # hoja atómica (fecha, Decimal, ...), ya validada por _es_arbol
+
+def _es_arbol(valor, vistos) -> bool:
+    """True si valor es un árbol que _copiar_arbol copia correctamente."""
+    tipo = type(valor)
+    if _es_atomico(valor):
+        return True
+    if tipo not in (dict, list, tuple, set) or id(valor) in vistos:
+        return False
+    vistos.add(id(valor))
+    if tipo is set:
+        return _solo_inmutables(valor)
+    hijos = valor.values() if tipo is dict else valor
+    return all(_es_arbol(v, vistos) for v in hijos)
+
+def _requiere_deepcopy(valores) -> bool:
+    """
+    True si algún valor mutable se alcanza dos veces desde los atributos
+    (dentro de uno o entre varios) o si hay un objeto cuyo contenido no se
+    puede recorrer: entonces sólo deepcopy, con su memo, conserva las
+    referencias compartidas. Los atómicos no cuentan; los objetos con
+    __deepcopy__ propio (Metadatos incluido) se copian con él, y los que
+    deepcopy copiaría por su __dict__ se recorren.
+    """
+    vistos = set()
+    pendientes = list(valores)
+    while pendientes:
+        valor = pendientes.pop()
+        tipo = type(valor)
+        if tipo in _INMUTABLES:
+            continue
+        if tipo is tuple:
+            pendientes.extend(valor)
+            continue
+        if _es_atomico(valor):
+            continue
+        if id(valor) in vistos:
+            return True
+        vistos.add(id(valor))
+        if tipo is dict:
+            pendientes.extend(valor.values())
+        elif tipo in (list, set):
+            pendientes.extend(valor)
+        elif hasattr(tipo, "__deepcopy__"):
+            continue
+        elif _estado_visible(valor):
+            pendientes.extend(vars(valor).values())
+        else:
+            return True
+    return False
+
+def _clonar_profundo(p):
+    """Plan de respaldo: deepcopy de todo el __dict__ con un único memo."""
+    nuevo = object.__new__(type(p))
+    nuevo.__dict__.update(copy.deepcopy(p.__dict__))
+    return nuevo
+
+def _estrategia(valor) -> str:
+    """Expresión que copia el atributo {v} según lo que contiene el prototipo."""
+    tipo = type(valor)
+    if _es_atomico(valor):
+        return "{v}"                                 # compartido
+    if tipo in (dict, list, set) and _solo_inmutables(valor.values() if tipo is dict else valor):
+        return tipo.__name__ + "({v})"               # copia superficial alcanza
+    if tipo is tuple and _solo_inmutables(valor):
+        return "{v}"
+    if isinstance(valor, Metadatos):
+        return "{v}.clone()"                         # copy-on-write
+    if _es_arbol(valor, set()):
+        return "_copiar_arbol({v})"
+    return "_deepcopy({v})"
+
+class RegistroPrototipos:
+    """
+    Registro de plantillas con nombre. Al registrar se genera, por tipo y
+    forma de los atributos, una función de clonado que comparte lo inmutable
+    y copia cada contenedor sólo lo necesario, sin el memo ni la reflexión
+    por objeto de copy.deepcopy. Las funciones generadas se reutilizan
+    entre prototipos con la misma forma.
+    """
+    _planes = {}  # (tipo, ((atributo, estrategia), ...)) -> función
+
+    def __init__(self):
+        self._prototipos = {}  # nombre -> (prototipo, función de clonado)
+
+    @classmethod
+    def _compilar(cls, tipo, forma):
+        plan = cls._planes.get((tipo, forma))
+        if plan is None:
+            campos = ", ".join(f"{nombre!r}: {expr.format(v=f'd[{nombre!r}]')}"
+                               for nombre, expr in forma)
+            codigo = (f"def clonar(p):\n"
+                      f"    d = p.__dict__\n"
+                      f"    n = _nuevo(_tipo)\n"
+                      f"    n.__dict__.update({{{campos}}})\n"
+                      f"    return n\n")
+            entorno = {"_nuevo": object.__new__, "_tipo": tipo, "_copiar_arbol": _copiar_arbol,
+                       "_deepcopy": copy.deepcopy}
+            exec(codigo, entorno)  # pylint: disable=exec-used
+            plan = cls._planes[(tipo, forma)] = entorno["clonar"]
+        return plan
+
+    def registrar(self, nombre: str, prototipo):
+        """
+        Guarda una copia privada de `prototipo` (así el plan sigue siendo
+        válido aunque el original cambie después) y compila su clonador.
+        Si los atributos comparten contenedores, se clona con deepcopy.
+        """
+        if not hasattr(prototipo, "__dict__"):
+            raise TypeError(f"{type(prototipo).__name__} no tiene __dict__ para clonar")
+        privado = copy.deepcopy(prototipo)
+        if _requiere_deepcopy(vars(privado).values()):
+            self._prototipos[nombre] = (privado, _clonar_profundo)
+            return
+        forma = tuple((k, _estrategia(v)) for k, v in vars(privado).items())
+        self._prototipos[nombre] = (privado, self._compilar(type(privado), forma))
+
+    def _buscar(self, nombre):
+        try:
+            return self._prototipos[nombre]
+        except KeyError:
+            raise KeyError(f"Prototipo no registrado: {nombre}") from None
+
+    def clone(self, nombre: str, **cambios):
+        """Clon del prototipo `nombre` con los atributos de `cambios` reemplazados."""
+        prototipo, clonar = self._buscar(nombre)
+        nuevo = clonar(prototipo)
+        nuevo.__dict__.update(cambios)
+        return nuevo
+
+    def clone_many(self, nombre: str, n: int, overrides=None) -> list:
+        """
+        n clones del prototipo. `overrides` es un dict aplicado a todos o una
+        secuencia con un dict por clon; la clave "atributo" reemplaza el
+        atributo y "atributo.clave" una entrada de ese atributo (un dict o
+        Metadatos), p.ej. {"metadatos.autor": "Juan"}.
+        """
+        prototipo, clonar = self._buscar(nombre)
+        clones = [clonar(prototipo) for _ in range(n)]
+        if overrides is None:
+            return clones
+        if isinstance(overrides, Mapping):
+            overrides = [overrides] * n
+        elif len(overrides) != n:
+            raise ValueError("overrides debe tener un dict por clon")
+        for clon, cambios in zip(clones, overrides):
+            for ruta, valor in cambios.items():
+                atributo, _, clave = ruta.partition(".")
+                if clave:
+                    getattr(clon, atributo)[clave] = valor
+                else:
+                    setattr(clon, atributo, valor)
+        return clones
+
+def _metadatos_ejemplo(claves: int) -> dict:
+    """Metadatos con la forma típica de una plantilla: campos, tags y un bloque anidado."""
+    datos = {f"campo_{i}": f"valor {i}" for i in range(claves)}
+    datos["tags"] = [f"tag{i}" for i in range(claves // 10 + 1)]
+    datos["revision"] = {"numero": 3, "aprobado": True, "firmas": ["Ana", "Juan"]}
+    return datos
+
+def benchmark(n: int):
+    """Clones por segundo: copy.deepcopy, plan compilado y clone_many, por tamaño de metadatos."""
+    registro = RegistroPrototipos()
+    print(f"{'claves':>8}{'deepcopy/s':>14}{'plan/s':>14}{'clone_many/s':>14}")
+    for claves in (10, 50, 200):
+        doc = Documento("Plantilla", "Texto base " * 100, _metadatos_ejemplo(claves))
+        registro.registrar("plantilla", doc)
+        inicio = time.perf_counter()
+        for _ in range(n):
+            copy.deepcopy(doc)
+        t_deep = time.perf_counter() - inicio
+        inicio = time.perf_counter()
+        for _ in range(n):
+            registro.clone("plantilla")
+        t_plan = time.perf_counter() - inicio
+        inicio = time.perf_counter()
+        clones = registro.clone_many("plantilla", n, overrides={"metadatos.campo_0": "otro"})
+        t_many = time.perf_counter() - inicio
+        assert clones[0].metadatos["revision"] == doc.metadatos["revision"]
+        assert clones[0].metadatos["revision"]["firmas"] is not doc.metadatos["revision"]["firmas"]
+        print(f"{claves:>8}{n / t_deep:>14,.0f}{n / t_plan:>14,.0f}{n / t_many:>14,.0f}")
+
 # Ejemplo
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Patrón Prototype")
+    parser.add_argument("--bench", type=int, metavar="N",
+                        help="compara copy.deepcopy con el registro clonando N veces")
+    args = parser.parse_args()
+    if args.bench:
+        benchmark(args.bench)
+        raise SystemExit
+
     doc1 = Documento("Informe", "Contenido principal", {"autor":"Ana", "fecha":"2025-06-10"})
     doc2 = doc1.clone()
     doc2.metadatos["autor"] = "Juan"
     print(doc1)  # autor: Ana
     print(doc2)  # autor: Juan
+
+    plantilla = Documento("Plantilla", "Texto base", {"autor": "Ana", "tags": {"area": "ventas"}})
+    doc3 = plantilla.clone(cow=True)
+    doc3.metadatos["tags"]["area"] = "compras"  # copia sólo metadatos["tags"]
+    print(plantilla)  # area: ventas
+    print(doc3)       # area: compras
+
+    registro = RegistroPrototipos()
+    registro.registrar("informe", doc1)
+    for doc in registro.clone_many("informe", 2, overrides=[{"metadatos.autor": "Eva"},
+                                                           {"titulo": "Anexo"}]):
+        print(doc)
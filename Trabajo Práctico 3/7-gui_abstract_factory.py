@@ -1,15 +1,48 @@
 # gui_abstract_factory.py
 # Patrón Abstract Factory – ejemplo de GUI multiplataforma
 
+import argparse
+import io
+import os
+import platform
+import sys
+import time
 from abc import ABC, abstractmethod
 
-# Productos abstractos
-class Label(ABC):
+# Productos abstractos. Son inmutables: un widget con un estilo dado se
+# puede compartir entre todas las pantallas (ver FlyweightFactory).
+class Widget(ABC):
+    __slots__ = ("estilo",)
+
+    def __init__(self, estilo: str = "normal"):
+        object.__setattr__(self, "estilo", estilo)
+
+    def __setattr__(self, nombre, valor):
+        raise AttributeError(f"{type(self).__name__} es inmutable")
+
+    def _decorar(self, texto: str) -> str:
+        return texto if self.estilo == "normal" else f"{texto} <{self.estilo}>"
+
+    @abstractmethod
+    def salida(self) -> str:
+        """Texto del widget al renderizar la pantalla."""
+
+class Label(Widget):
+    __slots__ = ()
+
+    def salida(self) -> str:
+        return self.render()
+
     @abstractmethod
     def render(self) -> str:
         pass
 
-class Button(ABC):
+class Button(Widget):
+    __slots__ = ()
+
+    def salida(self) -> str:
+        return self.click()
+
     @abstractmethod
     def click(self) -> str:
         pass
@@ -17,42 +50,128 @@ class Button(ABC):
 # Fábrica abstracta
 class GUIFactory(ABC):
     @abstractmethod
-    def create_label(self) -> Label:
+    def create_label(self, estilo: str = "normal") -> Label:
         pass
 
     @abstractmethod
-    def create_button(self) -> Button:
+    def create_button(self, estilo: str = "normal") -> Button:
         pass
 
 # Implementaciones Windows
 class WinLabel(Label):
+    __slots__ = ()
+
     def render(self) -> str:
-        return "[Label Windows]"
+        return self._decorar("[Label Windows]")
 
 class WinButton(Button):
+    __slots__ = ()
+
     def click(self) -> str:
-        return "Click Windows"
+        return self._decorar("Click Windows")
 
 class WinFactory(GUIFactory):
-    def create_label(self) -> Label:
-        return WinLabel()
-    def create_button(self) -> Button:
-        return WinButton()
+    def create_label(self, estilo: str = "normal") -> Label:
+        return WinLabel(estilo)
+    def create_button(self, estilo: str = "normal") -> Button:
+        return WinButton(estilo)
 
 # Implementaciones MacOS
 class MacLabel(Label):
+    __slots__ = ()
+
     def render(self) -> str:
-        return "(Label MacOS)"
+        return self._decorar("(Label MacOS)")
 
 class MacButton(Button):
+    __slots__ = ()
+
     def click(self) -> str:
-        return "Click MacOS"
+        return self._decorar("Click MacOS")
 
 class MacFactory(GUIFactory):
-    def create_label(self) -> Label:
-        return MacLabel()
-    def create_button(self) -> Button:
-        return MacButton()
+    def create_label(self, estilo: str = "normal") -> Label:
+        return MacLabel(estilo)
+    def create_button(self, estilo: str = "normal") -> Button:
+        return MacButton(estilo)
+
+# Fábricas por plataforma y flyweights
+class FlyweightFactory(GUIFactory):
+    """
+    Envuelve una fábrica concreta y crea cada widget una sola vez por
+    (tipo, estilo); las pantallas comparten esas instancias inmutables.
+    También guarda la salida de cada widget, que tampoco cambia.
+    """
+    def __init__(self, fabrica: GUIFactory):
+        self.fabrica = fabrica
+        self._widgets = {}
+        self._salidas = {}
+        self._crear = {"label": fabrica.create_label, "button": fabrica.create_button}
+
+    def widget(self, tipo: str, estilo: str = "normal") -> Widget:
+        clave = (tipo, estilo)
+        widget = self._widgets.get(clave)
+        if widget is None:
+            try:
+                crear = self._crear[tipo]
+            except KeyError:
+                raise ValueError(f"Tipo de widget desconocido: {tipo}") from None
+            widget = self._widgets[clave] = crear(estilo)
+        return widget
+
+    def create_label(self, estilo: str = "normal") -> Label:
+        return self.widget("label", estilo)
+
+    def create_button(self, estilo: str = "normal") -> Button:
+        return self.widget("button", estilo)
+
+    def salida(self, tipo: str, estilo: str = "normal") -> str:
+        clave = (tipo, estilo)
+        texto = self._salidas.get(clave)
+        if texto is None:
+            texto = self._salidas[clave] = self.widget(tipo, estilo).salida()
+        return texto
+
+    def render_arbol(self, arbol, out=None, sangria: str = "  ") -> str:
+        """
+        Renderiza un árbol de widgets de una sola vez. `arbol` es una lista
+        cuyos elementos son (tipo, estilo) o listas anidadas (contenedores,
+        que suman un nivel de sangría). Escribe todo con un único write en
+        `out` (si se pasa) y retorna el texto.
+        """
+        salidas, salida = self._salidas, self.salida
+        lineas = []
+        pila = [(iter(arbol), "")]
+        while pila:
+            hijos, prefijo = pila[-1]
+            for nodo in hijos:
+                if isinstance(nodo, list):
+                    lineas.append(f"{prefijo}+\n")
+                    pila.append((iter(nodo), prefijo + sangria))
+                    break
+                texto = salidas.get(nodo) or salida(*nodo)
+                lineas.append(f"{prefijo}{texto}\n")
+            else:
+                pila.pop()
+        texto = "".join(lineas)
+        if out is not None:
+            out.write(texto)
+        return texto
+
+# Fábrica concreta según platform.system(); GUI_PLATAFORMA la fuerza.
+FABRICAS = {"Windows": WinFactory, "Darwin": MacFactory}
+_fabrica = None
+
+def fabrica_plataforma(defecto: str = "Windows") -> FlyweightFactory:
+    """
+    Elige la fábrica de la plataforma la primera vez y después siempre
+    retorna la misma. Plataformas sin fábrica propia usan `defecto`.
+    """
+    global _fabrica  # uso controlado de estado compartido
+    if _fabrica is None:
+        sistema = os.environ.get("GUI_PLATAFORMA") or platform.system()
+        _fabrica = FlyweightFactory(FABRICAS.get(sistema, FABRICAS[defecto])())
+    return _fabrica
 
 # Client code
 def create_ui(factory: GUIFactory):
@@ -61,8 +180,60 @@ def create_ui(factory: GUIFactory):
     print(label.render())
     print(button.click())
 
+def pantalla_ejemplo(n: int) -> list:
+    """Árbol de ~n widgets: formularios de etiquetas y botones con pocos estilos."""
+    estilos = ("normal", "titulo", "peligro", "deshabilitado")
+    formularios = []
+    for i in range(0, n, 10):
+        campos = [("label", estilos[(i + j) % 4]) for j in range(7)]
+        formularios.append([campos, ("button", "normal"), ("button", "peligro"),
+                            ("button", estilos[i % 4])])
+    return formularios
+
+def benchmark(n: int):
+    """Pantalla de n widgets: un objeto y una llamada por widget vs render_arbol."""
+    arbol = pantalla_ejemplo(n)
+    fabrica = WinFactory()
+
+    def por_widget(nodos, out, prefijo=""):
+        for nodo in nodos:
+            if isinstance(nodo, list):
+                out.write(f"{prefijo}+\n")
+                por_widget(nodo, out, prefijo + "  ")
+            elif nodo[0] == "label":
+                out.write(f"{prefijo}{fabrica.create_label(nodo[1]).render()}\n")
+            else:
+                out.write(f"{prefijo}{fabrica.create_button(nodo[1]).click()}\n")
+
+    inicio = time.perf_counter()
+    esperado = io.StringIO()
+    por_widget(arbol, esperado)
+    t_obj = time.perf_counter() - inicio
+
+    flyweights = FlyweightFactory(WinFactory())
+    inicio = time.perf_counter()
+    texto = flyweights.render_arbol(arbol, io.StringIO())
+    t_lote = time.perf_counter() - inicio
+    assert texto == esperado.getvalue()
+
+    print(f"{n} widgets, {len(flyweights._widgets)} instancias compartidas")
+    print(f"por widget:   {t_obj * 1000:8.1f} ms")
+    print(f"render_arbol: {t_lote * 1000:8.1f} ms ({t_obj / t_lote:.1f}x)")
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Abstract Factory de GUI")
+    parser.add_argument("--bench", type=int, nargs="?", const=100_000, metavar="N",
+                        help="pantalla de N widgets (por defecto 100000)")
+    args = parser.parse_args()
+    if args.bench:
+        benchmark(args.bench)
+        raise SystemExit
+
     print("UI Windows:")
     create_ui(WinFactory())
     print("\nUI MacOS:")
     create_ui(MacFactory())
+    print("\nUI de la plataforma (flyweights, en lote):")
+    fabrica_plataforma().render_arbol(
+        [("label", "titulo"), [("label", "normal"), ("button", "normal")], ("button", "peligro")],
+        out=sys.stdout)
@@ -0,0 +1,204 @@
+# impuestos_engine.py
+# Cálculo de impuestos por lotes sobre arrays NumPy en centavos (int64)
+
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+from pathlib import Path
+
+import numpy as np
+
+# Las tasas se guardan como enteros en millonésimas: 0.012 -> 12000.
+ESCALA_TASA = 1_000_000
+
+# Tasas por defecto de Impuestos.calcular; el orden es el de las columnas
+# del desglose.
+TASAS = {"iva": "0.21", "iibb": "0.05", "municipal": "0.012"}
+
+# Con tasas menores a 1 (100%), base * tasa entra en int64 si la base
+# no supera este valor en centavos (~92 mil millones de pesos por línea).
+MAX_CENTAVOS = np.iinfo(np.int64).max // ESCALA_TASA
+
+# Filas que se leen por bloque al procesar un archivo.
+BLOQUE = 1 << 20
+
+
+def tasa_escalada(valor):
+    """
+    Convierte una tasa ("0.21", 0.21, Decimal) a millonésimas sin pasar por
+    aritmética float. Rechaza tasas negativas o con más de 6 decimales.
+    """
+    try:
+        escalada = Decimal(str(valor)) * ESCALA_TASA
+    except InvalidOperation as e:
+        raise ValueError(f"Tasa inválida: {valor!r}") from e
+    if escalada < 0 or escalada != escalada.to_integral_value():
+        raise ValueError(f"Tasa inválida (negativa o con más de 6 decimales): {valor!r}")
+    return int(escalada)
+
+
+def compilar_tasas(tasas=None):
+    """Retorna (nombres, array int64 de tasas en millonésimas)."""
+    tasas = TASAS if tasas is None else tasas
+    nombres = tuple(tasas)
+    return nombres, np.array([tasa_escalada(tasas[n]) for n in nombres], dtype=np.int64)
+
+
+def a_centavos(montos):
+    """
+    Convierte montos en pesos (float o texto) a centavos int64, redondeando
+    al centavo más cercano. Los importes con dos decimales son exactos
+    mientras no superen 2**53 centavos.
+    """
+    montos = np.asarray(montos, dtype=np.float64)
+    if not np.isfinite(montos).all():
+        raise ValueError("La base imponible debe ser un número finito")
+    return np.rint(montos * 100).astype(np.int64)
+
+
+def validar_bases(centavos):
+    """Aplica a todo el array la validación de Impuestos.calcular."""
+    negativas = np.flatnonzero(centavos < 0)
+    if negativas.size:
+        i = int(negativas[0])
+        raise ValueError(f"La base imponible no puede ser negativa "
+                         f"(fila {i}: {centavos[i] / 100:.2f}; {negativas.size} filas negativas)")
+    if centavos.size and int(centavos.max()) > MAX_CENTAVOS:
+        raise ValueError(f"Base imponible fuera de rango (máximo {MAX_CENTAVOS} centavos)")
+
+
+def preparar_bases(bases, centavos=False):
+    """Bases como vector int64 de centavos, ya validadas."""
+    if centavos:
+        base = np.asarray(bases)
+        if base.dtype.kind not in "iu":
+            raise ValueError("Con centavos=True las bases deben ser enteras")
+        base = base.astype(np.int64, copy=False)
+    else:
+        base = a_centavos(bases)
+    base = base.ravel()
+    validar_bases(base)
+    return base
+
+
+def componentes(centavos, tasas):
+    """
+    Matriz (filas, impuestos) con cada impuesto en centavos: base * tasa,
+    redondeado mitad hacia arriba (las bases ya son no negativas). `tasas`
+    es un vector común a todas las filas o una matriz con una fila de
+    tasas por base (ver impuestos_tasas.RegistroTasas).
+    """
+    if tasas.ndim == 1:
+        tasas = tasas[None, :]
+    return (centavos[:, None] * tasas + ESCALA_TASA // 2) // ESCALA_TASA
+
+
+class Desglose:
+    """
+    Resultado de un lote: base, cada impuesto y total por fila, todo en
+    centavos int64. totales() suma las columnas con enteros de Python.
+    """
+
+    def __init__(self, nombres, base, impuestos):
+        self.nombres = nombres
+        self.base = base
+        self.impuestos = impuestos                # (filas, len(nombres))
+        self.total = base + impuestos.sum(axis=1)
+
+    def __len__(self):
+        return len(self.base)
+
+    def __getitem__(self, nombre):
+        """Columna en centavos: "base", "total" o el nombre de un impuesto."""
+        if nombre in ("base", "total"):
+            return getattr(self, nombre)
+        return self.impuestos[:, self.nombres.index(nombre)]
+
+    def totales(self):
+        """Dict con la suma de cada columna, en centavos."""
+        sumas = {"base": int(self.base.sum(dtype=np.int64))}
+        for j, nombre in enumerate(self.nombres):
+            sumas[nombre] = int(self.impuestos[:, j].sum(dtype=np.int64))
+        sumas["total"] = int(self.total.sum(dtype=np.int64))
+        return sumas
+
+
+def calcular_lote(bases, tasas=None, centavos=False):
+    """
+    Desglose de un array de bases imponibles. Con centavos=True las bases
+    ya vienen como enteros en centavos; si no, se interpretan en pesos.
+    `tasas` es un dict nombre -> tasa o el resultado de compilar_tasas.
+    """
+    nombres, escaladas = tasas if isinstance(tasas, tuple) else compilar_tasas(tasas)
+    base = preparar_bases(bases, centavos)
+    return Desglose(nombres, base, componentes(base, escaladas))
+
+
+def _bloques_csv(path, columnas, bloque):
+    """
+    Genera, por bloque, una tupla con un array por columna (nombre o índice)
+    del CSV: la primera como float64 y las demás como texto.
+    """
+    with open(path, encoding="utf-8") as f:
+        encabezado = f.readline().rstrip("\r\n").split(",")
+        indices = [c if isinstance(c, int) else encabezado.index(c) for c in columnas]
+        while True:
+            lineas = list(islice(f, bloque))
+            if not lineas:
+                return
+            if len(indices) == 1:
+                yield (np.loadtxt(lineas, delimiter=",", usecols=indices[0],
+                                  dtype=np.float64, ndmin=1),)
+                continue
+            texto = np.loadtxt(lineas, delimiter=",", usecols=indices, dtype=str, ndmin=2)
+            yield (texto[:, 0].astype(np.float64), *texto[:, 1:].T)
+
+
+def _bloques_npy(path, bloque):
+    """Genera porciones de un .npy de una columna sin cargarlo entero (memmap)."""
+    datos = np.load(path, mmap_mode="r")
+    for inicio in range(0, len(datos), bloque):
+        yield np.asarray(datos[inicio:inicio + bloque])
+
+
+def desglose_por_bloques(path, columna="base", tasas=None, bloque=BLOQUE, registro=None,
+                         jurisdiccion="jurisdiccion", fecha="fecha"):
+    """
+    Procesa un archivo de columnas por bloques de `bloque` filas y genera un
+    Desglose por bloque. Acepta CSV con encabezado (columna en pesos) o un
+    .npy de una columna: enteros en centavos o floats en pesos.
+    Con `registro` (un RegistroTasas), las tasas de cada fila salen de sus
+    columnas `jurisdiccion` y `fecha` del CSV en lugar de `tasas`.
+    """
+    if registro is not None:
+        if Path(path).suffix == ".npy":
+            raise ValueError("Con registro de tasas el archivo debe ser un CSV")
+        for valores, jurisdicciones, fechas in _bloques_csv(
+                path, (columna, jurisdiccion, fecha), bloque):
+            yield registro.calcular_lote(valores, jurisdicciones, fechas)
+        return
+    compiladas = tasas if isinstance(tasas, tuple) else compilar_tasas(tasas)
+    if Path(path).suffix == ".npy":
+        for valores in _bloques_npy(path, bloque):
+            yield calcular_lote(valores, compiladas, centavos=valores.dtype.kind in "iu")
+    else:
+        for (valores,) in _bloques_csv(path, (columna,), bloque):
+            yield calcular_lote(valores, compiladas)
+
+
+def totales_archivo(path, columna="base", tasas=None, bloque=BLOQUE, registro=None):
+    """Totales en centavos de todo el archivo, con memoria acotada por `bloque`."""
+    acumulado = {}
+    filas = 0
+    for desglose in desglose_por_bloques(path, columna, tasas, bloque, registro):
+        filas += len(desglose)
+        for nombre, valor in desglose.totales().items():
+            acumulado[nombre] = acumulado.get(nombre, 0) + valor
+    acumulado["filas"] = filas
+    return acumulado
+
+
+def formato_pesos(centavos):
+    """12345 -> '123.45' (exacto, sin float)."""
+    signo = "-" if centavos < 0 else ""
+    pesos, resto = divmod(abs(int(centavos)), 100)
+    return f"{signo}{pesos}.{resto:02d}"
@@ -0,0 +1,142 @@
+# impuestos_tasas.py
+# Registro de tasas por jurisdicción y fecha de vigencia, compilado a arrays
+
+import csv
+import hashlib
+import os
+from pathlib import Path
+
+import numpy as np
+
+from impuestos_engine import Desglose, componentes, preparar_bases, tasa_escalada
+
+# Versión del formato del caché compilado; cambiarla invalida los .npz viejos.
+FORMATO = 1
+
+# Las claves combinan jurisdicción y día: codigo << 32 | (día + 2**31).
+_DESPLAZAMIENTO = 1 << 31
+
+
+def _claves(codigos, dias):
+    return (codigos.astype(np.int64) << 32) | (dias.astype(np.int64) + _DESPLAZAMIENTO)
+
+
+def _dias(fechas):
+    """Fechas ISO (texto, date o datetime64) a días desde 1970-01-01, int64."""
+    return np.asarray(fechas, dtype="datetime64[D]").astype(np.int64)
+
+
+class RegistroTasas:
+    """
+    Tablas de tasas por (jurisdicción, fecha desde la que rigen). Se compilan
+    a un índice ordenado: resolver un lote es un searchsorted sobre claves
+    int64, sin recorrer diccionarios por fila. Una tabla rige desde su fecha
+    hasta la fecha de la siguiente tabla de la misma jurisdicción.
+    """
+
+    def __init__(self, nombres, jurisdicciones, claves, tasas):
+        self.nombres = tuple(nombres)                # impuestos, en orden de columna
+        self.jurisdicciones = np.asarray(jurisdicciones, dtype=str)  # ordenadas
+        self._claves = claves                        # int64, ordenadas
+        self._tasas = tasas                          # (tablas, impuestos) en millonésimas
+
+    @classmethod
+    def desde_filas(cls, filas, nombres):
+        """
+        Compila filas (jurisdicción, fecha desde, tasa1, tasa2, ...), con las
+        tasas en el orden de `nombres`. Rechaza fechas repetidas.
+        """
+        filas = list(filas)
+        if not filas:
+            raise ValueError("El registro de tasas está vacío")
+        jurisdicciones = np.unique(np.array([f[0] for f in filas], dtype=str))
+        codigos = np.searchsorted(jurisdicciones, np.array([f[0] for f in filas], dtype=str))
+        claves = _claves(codigos, _dias([f[1] for f in filas]))
+        tasas = np.array([[tasa_escalada(t) for t in f[2:]] for f in filas], dtype=np.int64)
+        if tasas.shape[1] != len(nombres):
+            raise ValueError(f"Cada fila debe tener {len(nombres)} tasas: {', '.join(nombres)}")
+        orden = np.argsort(claves, kind="stable")
+        claves, tasas = claves[orden], tasas[orden]
+        repetidas = np.flatnonzero(claves[1:] == claves[:-1])
+        if repetidas.size:
+            f = filas[orden[repetidas[0]]]
+            raise ValueError(f"Tabla repetida para {f[0]} desde {f[1]}")
+        return cls(nombres, jurisdicciones, claves, tasas)
+
+    @classmethod
+    def leer_csv(cls, path):
+        """CSV con encabezado: jurisdiccion,desde,<impuesto>,<impuesto>,..."""
+        with open(path, encoding="utf-8", newline="") as f:
+            lector = csv.reader(f)
+            encabezado = next(lector)
+            return cls.desde_filas((fila for fila in lector if fila), encabezado[2:])
+
+    @classmethod
+    def cargar(cls, path, cache=True):
+        """
+        Lee el CSV de tasas. Con cache=True guarda la versión compilada en
+        `<path>.npz` y la reutiliza mientras el CSV no cambie (se compara su
+        SHA-256), así que recargar no vuelve a parsear ni a ordenar.
+        """
+        datos = Path(path).read_bytes()
+        firma = hashlib.sha256(datos).hexdigest()
+        compilado = Path(f"{path}.npz")
+        if cache and compilado.exists():
+            try:
+                with np.load(compilado) as npz:
+                    if int(npz["formato"]) == FORMATO and str(npz["firma"]) == firma:
+                        return cls(npz["nombres"].tolist(), npz["jurisdicciones"],
+                                   npz["claves"], npz["tasas"])
+            except (OSError, KeyError, ValueError):
+                pass  # caché ilegible: se recompila
+        registro = cls.leer_csv(path)
+        if cache:
+            registro.guardar(compilado, firma)
+        return registro
+
+    def guardar(self, path, firma=""):
+        """Escribe la versión compilada (reemplazo atómico del archivo)."""
+        temporal = f"{path}.{os.getpid()}.tmp"
+        with open(temporal, "wb") as f:
+            np.savez(f, formato=FORMATO, firma=firma, nombres=np.array(self.nombres),
+                     jurisdicciones=self.jurisdicciones, claves=self._claves, tasas=self._tasas)
+        os.replace(temporal, path)
+
+    def codigos(self, jurisdicciones):
+        """Código int de cada jurisdicción; ValueError si alguna no está registrada."""
+        consulta = np.atleast_1d(np.asarray(jurisdicciones, dtype=str))
+        codigos = np.searchsorted(self.jurisdicciones, consulta)
+        validos = codigos < len(self.jurisdicciones)
+        validos[validos] = self.jurisdicciones[codigos[validos]] == consulta[validos]
+        if not validos.all():
+            malo = consulta.ravel()[np.flatnonzero(~validos.ravel())[0]]
+            raise ValueError(f"Jurisdicción desconocida: {malo}")
+        return codigos
+
+    def resolver(self, jurisdicciones, fechas):
+        """
+        Matriz (filas, impuestos) con las tasas vigentes de cada fila, en
+        millonésimas. Una jurisdicción o fecha escalar se aplica a todas.
+        """
+        codigos, dias = np.broadcast_arrays(self.codigos(jurisdicciones), _dias(fechas))
+        codigos, dias = codigos.ravel(), dias.ravel()
+        posiciones = np.searchsorted(self._claves, _claves(codigos, dias), side="right") - 1
+        # La tabla encontrada debe ser de la misma jurisdicción; si no, la
+        # fecha es anterior a la primera tabla de esa jurisdicción.
+        validas = posiciones >= 0
+        validas[validas] = (self._claves[posiciones[validas]] >> 32) == codigos[validas]
+        if not validas.all():
+            i = int(np.flatnonzero(~validas)[0])
+            raise ValueError(f"No hay tasas vigentes para {self.jurisdicciones[codigos[i]]} "
+                             f"al {np.datetime64(int(dias[i]), 'D')}")
+        return self._tasas[posiciones]
+
+    def calcular_lote(self, bases, jurisdicciones, fechas, centavos=False):
+        """Desglose como impuestos_engine.calcular_lote, con tasas por fila."""
+        base = preparar_bases(bases, centavos)
+        tasas = self.resolver(jurisdicciones, fechas)
+        if len(tasas) == 1 and len(base) != 1:
+            tasas = tasas[0]
+        elif len(tasas) != len(base):
+            raise ValueError("Bases, jurisdicciones y fechas deben tener el mismo largo")
+        return Desglose(self.nombres, base, componentes(base, tasas))
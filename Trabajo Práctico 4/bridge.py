@@ -1,24 +1,47 @@
+import argparse
+import random
+import time
 from abc import ABC, abstractmethod
+from collections import defaultdict
+from typing import Optional
 
 # Implementador
 class RollingMill(ABC):
+    # Modelo de planta para el planificador: ancho máximo de lámina (m),
+    # metros de ancho laminados por hora y horas de cambio de espesor.
+    ancho_maximo = float("inf")
+    metros_por_hora = 1.0
+    cambio_espesor = 0.0
+
     @abstractmethod
     def produce(self, thickness: float, width: float) -> str:
         pass
 
+    def duracion(self, width: float) -> float:
+        """Horas que tarda en laminar una lámina de `width` metros."""
+        return width / self.metros_por_hora
+
 class Mill5m(RollingMill):
+    ancho_maximo = 5.0
+    metros_por_hora = 20.0
+    cambio_espesor = 0.5
+
     def produce(self, thickness: float, width: float) -> str:
         return (f"Producida lámina de {thickness}\" x {width}m "
                 f"en tren de 5m")
 
 class Mill10m(RollingMill):
+    ancho_maximo = 10.0
+    metros_por_hora = 30.0
+    cambio_espesor = 0.75
+
     def produce(self, thickness: float, width: float) -> str:
         return (f"Producida lámina de {thickness}\" x {width}m "
                 f"en tren de 10m")
 
 # Abstracción
 class Laminate:
-    def __init__(self, thickness: float, width: float, mill: RollingMill):
+    def __init__(self, thickness: float, width: float, mill: Optional[RollingMill] = None):
         self.thickness = thickness
         self.width = width
         self.mill = mill
@@ -27,11 +50,199 @@ class Laminate:
         self.mill = mill
 
     def produce(self) -> str:
+        if self.mill is None:
+            raise ValueError("La lámina no tiene tren asignado")
         return self.mill.produce(self.thickness, self.width)
 
+# Planificación por lotes
+class Plan:
+    """
+    Resultado de MillScheduler.planificar: por cada tren, la secuencia de
+    (laminado, inicio, fin) en horas desde el comienzo del turno.
+    """
+    def __init__(self, mills):
+        self.mills = mills
+        self.secuencias = [[] for _ in mills]
+        self.cambios = 0
+
+    @property
+    def makespan(self) -> float:
+        return max((s[-1][2] for s in self.secuencias if s), default=0.0)
+
+    def ejecutar(self):
+        """Asigna cada laminado a su tren (set_mill) y lo produce, en orden."""
+        resultados = []
+        for mill, secuencia in zip(self.mills, self.secuencias):
+            for laminado, _, _ in secuencia:
+                laminado.set_mill(mill)
+                resultados.append(laminado.produce())
+        return resultados
+
+class MillScheduler:
+    """
+    Asigna un lote de pedidos Laminate a un pool de trenes:
+    - Cada pedido sólo puede ir a trenes con ancho_maximo >= su ancho.
+    - Los pedidos del mismo espesor se agrupan, sin importar su ancho, para
+      evitar cambios; un grupo se parte sólo si supera la carga media por
+      tren.
+    - Los grupos se reparten primero los de anchos más restringidos y,
+      dentro de cada ancho, de mayor a menor trabajo (LPT), al tren
+      elegible que termine antes, contando el cambio de espesor si hace
+      falta. Los pedidos angostos de un grupo ancho viajan con él mientras
+      los trenes anchos tengan holgura respecto de la cota del makespan;
+      si no, se separan y van con los grupos de su ancho.
+    Con pocos trenes y anchos el costo es O(n + g log g), g = cantidad de grupos.
+    """
+    def __init__(self, mills):
+        if not mills:
+            raise ValueError("El pool de trenes está vacío")
+        self.mills = list(mills)
+        # Clases de ancho: índice del menor ancho_maximo donde entra la lámina
+        self._anchos = sorted({m.ancho_maximo for m in self.mills})
+        self._elegibles = [[i for i, m in enumerate(self.mills) if m.ancho_maximo >= ancho]
+                           for ancho in self._anchos]
+        # Metros por hora de los trenes que admiten cada clase de ancho
+        self._velocidades = [sum(self.mills[i].metros_por_hora for i in elegibles)
+                             for elegibles in self._elegibles]
+
+    def _clase(self, width: float) -> int:
+        for i, ancho in enumerate(self._anchos):
+            if width <= ancho:
+                return i
+        raise ValueError(f"Ningún tren admite láminas de {width}m de ancho")
+
+    def _requeridos(self, laminados):
+        """Por clase de ancho c, metros de los pedidos que sólo entran en trenes de clase >= c."""
+        metros = [0.0] * len(self._anchos)
+        for lam in laminados:
+            metros[self._clase(lam.width)] += lam.width
+        for c in range(len(metros) - 2, -1, -1):
+            metros[c] += metros[c + 1]
+        return metros
+
+    def cota(self, laminados) -> float:
+        """
+        Cota inferior del makespan: para cada ancho, los pedidos que sólo
+        entran en trenes de ese ancho o más, a la velocidad combinada de esos trenes.
+        """
+        return max(m / v for m, v in zip(self._requeridos(laminados), self._velocidades))
+
+    def _grupos(self, laminados):
+        """
+        Agrupa por espesor y parte cada grupo por carga. Cada trozo es
+        (metros, espesor, [(clase, laminado), ...]), los más anchos primero.
+        """
+        grupos = defaultdict(list)
+        total = 0.0
+        for lam in laminados:
+            grupos[lam.thickness].append((self._clase(lam.width), lam))
+            total += lam.width
+        # Trabajo medido en metros de ancho: un grupo con más que la carga
+        # media por tren se parte en trozos, para no desbalancear el turno.
+        tope = max(total / len(self.mills), 1e-9)
+        trozos = []
+        for espesor, pedidos in grupos.items():
+            pedidos.sort(key=lambda p: -p[0])
+            trozo, metros = [], 0.0
+            for clase, lam in pedidos:
+                if trozo and metros + lam.width > tope:
+                    trozos.append((metros, espesor, trozo))
+                    trozo, metros = [], 0.0
+                trozo.append((clase, lam))
+                metros += lam.width
+            trozos.append((metros, espesor, trozo))
+        return trozos
+
+    def planificar(self, laminados) -> Plan:
+        plan = Plan(self.mills)
+        fin = [0.0] * len(self.mills)
+        ultimo = [None] * len(self.mills)
+        objetivo = self.cota(laminados)
+        # Trozos por la clase de su pedido más ancho; se recorren de la más
+        # restringida a la menos, así los separados de una clase caen en una
+        # cola que todavía no se procesó y, al llegar a la clase c, sólo
+        # quedan sin asignar pedidos de clase <= c.
+        restantes = [0.0] * len(self._anchos)  # metros sin asignar por clase exacta
+        for lam in laminados:
+            restantes[self._clase(lam.width)] += lam.width
+        colas = [[] for _ in self._anchos]
+        for trozo in self._grupos(laminados):
+            colas[trozo[2][0][0]].append(trozo)
+        for clase in reversed(range(len(self._anchos))):
+            colas[clase].sort(key=lambda t: (-t[0], t[1]))  # LPT; a igual trabajo, por espesor
+            for _, espesor, pedidos in colas[clase]:
+                angostos = [p for p in pedidos if p[0] < clase]
+                if angostos:
+                    # Metros que los trenes de esta clase pueden laminar hasta
+                    # la cota sin postergar a los pedidos que sólo entran en ellos
+                    holgura = sum((objetivo - fin[i]) * self.mills[i].metros_por_hora
+                                  for i in self._elegibles[clase]) - restantes[clase]
+                    metros = sum(lam.width for _, lam in angostos)
+                    if metros > holgura:
+                        pedidos = pedidos[:len(pedidos) - len(angostos)]
+                        colas[angostos[0][0]].append((metros, espesor, angostos))
+                mejor, mejor_fin = None, None
+                for i in self._elegibles[clase]:
+                    mill = self.mills[i]
+                    cambio = mill.cambio_espesor if ultimo[i] not in (None, espesor) else 0.0
+                    termina = fin[i] + cambio + sum(mill.duracion(l.width) for _, l in pedidos)
+                    if mejor_fin is None or termina < mejor_fin:
+                        mejor, mejor_fin = i, termina
+                mill, secuencia = self.mills[mejor], plan.secuencias[mejor]
+                if ultimo[mejor] not in (None, espesor):
+                    fin[mejor] += mill.cambio_espesor
+                    plan.cambios += 1
+                t = fin[mejor]
+                for c, lam in pedidos:
+                    inicio, t = t, t + mill.duracion(lam.width)
+                    secuencia.append((lam, inicio, t))
+                    restantes[c] -= lam.width
+                fin[mejor], ultimo[mejor] = t, espesor
+        return plan
+
+def simular(n: int, mills, espesores: int = 20, semilla: int = 0):
+    """Planifica n pedidos aleatorios; retorna (plan, segundos de cálculo, cota inferior)."""
+    rng = random.Random(semilla)
+    valores = [round(0.1 + 0.05 * i, 2) for i in range(espesores)]
+    pedidos = [Laminate(rng.choice(valores), round(rng.uniform(0.5, 9.5), 2)) for _ in range(n)]
+    planificador = MillScheduler(mills)
+    inicio = time.perf_counter()
+    plan = planificador.planificar(pedidos)
+    segundos = time.perf_counter() - inicio
+    return plan, segundos, planificador.cota(pedidos)
+
+def benchmark(n: int):
+    """Velocidad de planificación y makespan para n/10 y n pedidos (escala ~lineal)."""
+    mills = [Mill5m(), Mill5m(), Mill5m(), Mill10m(), Mill10m()]
+    print(f"{'pedidos':>9}{'planif./s':>13}{'makespan h':>12}{'cota h':>9}"
+          f"{'láminas/h':>11}{'cambios':>9}")
+    for cantidad in (n // 10, n):
+        if cantidad < 1:
+            continue  # n < 10: sólo la fila de n pedidos
+        plan, segundos, cota = simular(cantidad, mills)
+        por_hora = cantidad / plan.makespan if plan.makespan else 0.0
+        print(f"{cantidad:>9}{cantidad / segundos:>13,.0f}{plan.makespan:>12.1f}"
+              f"{cota:>9.1f}{por_hora:>11.1f}{plan.cambios:>9}")
+
 # Ejemplo de uso:
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bridge Laminate/RollingMill")
+    parser.add_argument("--bench", type=int, metavar="N",
+                        help="simula la planificación de N pedidos")
+    args = parser.parse_args()
+    if args.bench is not None and args.bench < 1:
+        parser.error("--bench debe ser un entero positivo")
+    if args.bench:
+        benchmark(args.bench)
+        raise SystemExit
+
     lam = Laminate(0.5, 1.5, Mill5m())
     print(lam.produce())   # Tren 5m
     lam.set_mill(Mill10m())
     print(lam.produce())   # Ahora tren 10m
+
+    pedidos = [Laminate(0.5, 1.5), Laminate(0.5, 7.0), Laminate(0.25, 3.0), Laminate(0.5, 2.0)]
+    plan = MillScheduler([Mill5m(), Mill10m()]).planificar(pedidos)
+    for linea in plan.ejecutar():
+        print(linea)
+    print(f"makespan: {plan.makespan:.2f} h, cambios de espesor: {plan.cambios}")
@@ -1,5 +1,12 @@
 # chain_of_responsibility.py
 
+import sys
+from pathlib import Path
+
+# El test de primalidad se comparte con el TP1 (Trabajo Práctico 1/src).
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "Trabajo Práctico 1" / "src"))
+from primality import is_prime  # pylint: disable=wrong-import-position
+
 class Handler:
     """Clase base del patrón Cadena de Responsabilidad."""
     def __init__(self, siguiente=None):
@@ -19,12 +26,7 @@ class PrimoHandler(Handler):
         super().__init__(siguiente)
 
     def es_primo(self, n):
-        if n < 2:
-            return False
-        for i in range(2, int(n**0.5) + 1):
-            if n % i == 0:
-                return False
-        return True
+        return is_prime(n)
 
     def manejar(self, número):
         if self.es_primo(número):